@@ -0,0 +1,318 @@
+"""Memory-mapped binary exercise banks.
+
+A bank is a 64-byte header followed by fixed-width little-endian records:
+
+    header   magic "MESIMBNK", format version, record size, generator
+             version, seed, record count, SHA-256 of the sampling laws
+             spec (laws.py) — 64 bytes
+    record   typ, flags, b_rad, then numerator / denominator pairs (int32)
+             for a, b, c and delta — 36 bytes per exercise
+
+b is ``b_num / (b_den * sqrt(b_rad))``; b_rad is 1 unless b is a surd
+(type 2 with a non-square l).  ``FLAG_FLOAT`` marks exercises whose
+generator works in floats (type 2), so they are rebuilt as floats.
+
+Banks are opened with ``np.memmap``: nothing is read until a record is
+touched, so drawing from a multi-GB bank is instant.  The GUI draws its
+quizzes from the bank named by ``MESIM_BANK`` (or ``main.py --bank``).
+
+    python bank.py bank.bin -n 10000000 --seed 42
+"""
+import argparse
+import collections
+import functools
+import math
+import os
+import struct
+import warnings
+from fractions import Fraction
+
+import numpy as np
+
+from generators import Exercise, GENERATOR_VERSION, LAWS
+from support import get_index
+
+BANK_PATH      = os.environ.get("MESIM_BANK") or None
+FORMAT_VERSION = 1
+FLAG_FLOAT     = 1
+
+BANK_DTYPE = np.dtype([
+    ("typ",   "u1"), ("flags", "u1"), ("b_rad", "u1"), ("_pad",  "u1"),
+    ("a_num", "<i4"), ("a_den", "<i4"),
+    ("b_num", "<i4"), ("b_den", "<i4"),
+    ("c_num", "<i4"), ("c_den", "<i4"),
+    ("d_num", "<i4"), ("d_den", "<i4"),
+])
+
+_MAGIC       = b"MESIMBNK"
+_HEADER      = struct.Struct("<8sHHIQQ32s")     # ... laws digest (zeros: unknown)
+HEADER_SIZE  = 64
+
+# Record fields that identify an equation (a, b, c)
+_EQ_FIELDS = ("a_num", "a_den", "b_num", "b_den", "b_rad", "c_num", "c_den")
+MAX_MISSES = 2000
+POOL_CACHE = 64         # decoded exercises an ExercisePool keeps
+
+_SOLUTIONS = {}         # equation fields -> Solution, shared by every pool
+
+
+# ─── RECORD CONVERSION ───────────────────────────────────────────────────────
+def _exact(v, max_den: int = 1000) -> Fraction:
+    """Return v as a Fraction, snapping floats to the nearest small fraction."""
+    if isinstance(v, float):
+        return Fraction(v).limit_denominator(max_den)
+    return Fraction(v)
+
+
+def _surd(b: float):
+    """Return (num, den, rad) with b ≈ num / (den·√rad) and rad square-free."""
+    # Recover b² as a small fraction, then split √(n/d) = k·√r / d.  Trying
+    # every rad in turn instead lets a large-denominator fraction pass for a
+    # surd (26.72… stored as 211898 / (881·√81)) and overflows Δ.
+    sq = Fraction(b * b).limit_denominator(1000)
+    if not math.isclose(float(sq), b * b, rel_tol=1e-12, abs_tol=1e-12):
+        raise ValueError(f"cannot store coefficient {b!r} exactly")
+    k, rad, f = 1, sq.numerator * sq.denominator, 2
+    while f * f <= rad:
+        while rad % (f * f) == 0:
+            rad //= f * f
+            k   *= f
+        f += 1
+    q = Fraction(k * rad, sq.denominator) * (1 if b >= 0 else -1)
+    if rad > 255 or not math.isclose(float(q) / math.sqrt(rad), b,
+                                     rel_tol=1e-12, abs_tol=1e-12):
+        raise ValueError(f"cannot store coefficient {b!r} exactly")
+    return q.numerator, q.denominator, rad
+
+
+def to_record(ex: Exercise) -> np.void:
+    """Pack one Exercise into a BANK_DTYPE record."""
+    rec   = np.zeros((), dtype=BANK_DTYPE)
+    a, c  = _exact(ex.a), _exact(ex.c)
+    if isinstance(ex.b, float):
+        b_num, b_den, rad = _surd(ex.b)
+    else:
+        b = Fraction(ex.b)
+        b_num, b_den, rad = b.numerator, b.denominator, 1
+    # Δ = b² − 4ac, exact even when b is a surd
+    delta = Fraction(b_num * b_num, b_den * b_den * rad) - 4 * a * c
+
+    rec["typ"], rec["b_rad"] = ex.typ, rad
+    rec["flags"] = FLAG_FLOAT if isinstance(ex.b, float) else 0
+    rec["a_num"], rec["a_den"] = a.numerator, a.denominator
+    rec["b_num"], rec["b_den"] = b_num, b_den
+    rec["c_num"], rec["c_den"] = c.numerator, c.denominator
+    rec["d_num"], rec["d_den"] = delta.numerator, delta.denominator
+    return rec
+
+
+def _value(num, den):
+    num, den = int(num), int(den)
+    return num if den == 1 else Fraction(num, den)
+
+
+def from_record(rec) -> Exercise:
+    """Rebuild an Exercise from one BANK_DTYPE record."""
+    a     = _value(rec["a_num"], rec["a_den"])
+    c     = _value(rec["c_num"], rec["c_den"])
+    delta = _value(rec["d_num"], rec["d_den"])
+    rad   = int(rec["b_rad"])
+    if rec["flags"] & FLAG_FLOAT:
+        b = int(rec["b_num"]) / (int(rec["b_den"]) * math.sqrt(rad))
+        c, delta = float(c), float(delta)
+    else:
+        b = _value(rec["b_num"], rec["b_den"])
+    return Exercise(a, b, c, delta, int(rec["typ"]))
+
+
+class ExercisePool:
+    """A sequence of exercises stored as packed records, built on access.
+
+    36 bytes per exercise instead of a full Exercise object.  Indexing an
+    int rebuilds one Exercise and keeps the last POOL_CACHE built ones, so
+    the screens showing the current or visible exercises reuse the same
+    objects; slicing returns a pool view.  ``prepare`` computes every
+    worked solution up front, so building an exercise never has to.
+    """
+    __slots__ = ("records", "solutions", "_cache")
+
+    def __init__(self, exercises=(), records: np.ndarray = None, solutions: list = None):
+        if records is None:
+            records = np.array([to_record(ex) for ex in exercises], dtype=BANK_DTYPE)
+        self.records   = records
+        self.solutions = solutions      # one Solution per record once prepared
+        self._cache    = collections.OrderedDict()
+
+    def prepare(self) -> "ExercisePool":
+        """Compute the worked solutions of the whole pool, once per equation."""
+        if self.solutions is None:
+            self.solutions = [_solution(r) for r in self.records]
+        return self
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return ExercisePool(records=self.records[i],
+                                solutions=self.solutions and self.solutions[i])
+        i  = range(len(self.records))[i]
+        ex = self._cache.get(i)
+        if ex is None:
+            ex = self._cache[i] = self._build(i)
+            if len(self._cache) > POOL_CACHE:
+                self._cache.popitem(last=False)
+        else:
+            self._cache.move_to_end(i)
+        return ex
+
+    def __iter__(self):
+        return (self._build(i) for i in range(len(self.records)))
+
+    def _build(self, i: int) -> Exercise:
+        ex = from_record(self.records[i])
+        if self.solutions is not None:
+            ex._solution = self.solutions[i]
+        return ex
+
+
+def _eq_key(rec) -> tuple:
+    return tuple(int(rec[f]) for f in _EQ_FIELDS)
+
+
+def _solution(rec):
+    """Return the worked solution of a record's equation, built once per process."""
+    key = _eq_key(rec)
+    sol = _SOLUTIONS.get(key)
+    if sol is None:
+        sol = _SOLUTIONS[key] = from_record(rec).solution
+    return sol
+
+
+@functools.lru_cache(maxsize=None)
+def _eq_lookup() -> dict:
+    """Map the (a, b, c) fields of every support record to its equation id."""
+    eq_id = get_index().eq_id
+    return {_eq_key(rec): int(eq_id[i]) for i, rec in enumerate(support_records())}
+
+
+@functools.lru_cache(maxsize=None)
+def support_records() -> np.ndarray:
+    """Return one record per outcome of the support index, in index order."""
+    index = get_index()
+    table = np.empty(len(index), dtype=BANK_DTYPE)
+    for i in range(len(index)):
+        table[i] = to_record(index.exercise(i))
+    return table
+
+
+# ─── WRITING ─────────────────────────────────────────────────────────────────
+def write_bank(path: str, n: int, seed: int = 0, chunk: int = 1 << 20,
+               **constraints) -> None:
+    """Write a bank of ``n`` exercises drawn from the generate_exercise law.
+
+    Draws are outcome ids from the support index (optionally constrained,
+    see ``SupportIndex.mask``) gathered from a precomputed record table, so
+    writing costs one RNG call and one copy per exercise.
+    """
+    index = get_index()
+    table = support_records()
+    rng   = np.random.default_rng(seed)
+    with open(path, "wb") as f:
+        header = _HEADER.pack(_MAGIC, FORMAT_VERSION, BANK_DTYPE.itemsize,
+                              GENERATOR_VERSION, seed, n, bytes.fromhex(LAWS.digest))
+        f.write(header.ljust(HEADER_SIZE, b"\0"))
+        for start in range(0, n, chunk):
+            ids = index.sample_ids(min(chunk, n - start), rng, **constraints)
+            f.write(table[ids].tobytes())
+
+
+# ─── READING ─────────────────────────────────────────────────────────────────
+class ExerciseBank:
+    """Read-only, memory-mapped view of a bank file."""
+
+    def __init__(self, path: str):
+        with open(path, "rb") as f:
+            head = f.read(HEADER_SIZE)
+        if len(head) < HEADER_SIZE:
+            raise ValueError(f"{path}: not an exercise bank")
+        magic, fmt, size, gen, seed, count, digest = _HEADER.unpack_from(head)
+        if magic != _MAGIC or size != BANK_DTYPE.itemsize:
+            raise ValueError(f"{path}: not an exercise bank")
+        if fmt != FORMAT_VERSION:
+            raise ValueError(f"{path}: bank format {fmt}, expected {FORMAT_VERSION}")
+        self.path              = path
+        self.seed              = seed
+        self.generator_version = gen
+        self.laws_digest       = digest.hex() if any(digest) else None
+        if gen != GENERATOR_VERSION:
+            warnings.warn(f"{path}: written by generator version {gen}, "
+                          f"running {GENERATOR_VERSION}")
+        if self.laws_digest is None:
+            warnings.warn(f"{path}: sampling laws unknown (bank predates the digest)")
+        elif self.laws_digest != LAWS.digest:
+            raise ValueError(f"{path}: drawn from other sampling laws than {LAWS.path};"
+                             " rewrite it with bank.py")
+        self.records = np.memmap(path, dtype=BANK_DTYPE, mode="r",
+                                 offset=HEADER_SIZE, shape=(count,))
+
+    def __len__(self):
+        return len(self.records)
+
+    def __getitem__(self, i: int) -> Exercise:
+        return from_record(self.records[i])
+
+    def draw(self, n: int, rng=None) -> ExercisePool:
+        """Return ``n`` exercises at uniformly random positions of the bank."""
+        rng = rng or np.random.default_rng()
+        return ExercisePool(records=np.array(self.records[rng.integers(0, len(self), n)]))
+
+    def draw_fresh(self, n: int, seen, rng=None) -> ExercisePool:
+        """Like ``draw``, but skip equations in ``seen`` (a seen.SeenSet) and
+        add the drawn ones to it: no equation repeats until the bank's run out.
+
+        After MAX_MISSES consecutive seen equations the bank is taken as
+        exhausted: the equations met in those misses are cleared and a new
+        cycle starts, as in ``seen.draw_fresh``; those drawn earlier in this
+        call stay seen unless nothing else is left.  Records outside the
+        support (a bank predating the laws digest) are skipped.
+        """
+        rng    = rng or np.random.default_rng()
+        lookup = _eq_lookup()
+        picked, drawn, missed, misses = [], set(), set(), 0
+        while len(picked) < n:
+            pos = int(rng.integers(0, len(self)))
+            e   = lookup.get(_eq_key(self.records[pos]))
+            if e is None or e in seen:    # None: outside the support (older laws)
+                if e is not None:
+                    missed.add(e)
+                misses += 1
+                if misses >= MAX_MISSES:  # bank exhausted: start a new cycle
+                    if not missed:
+                        raise ValueError(f"{self.path}: no record matches the sampling laws")
+                    # This call's equations stay seen, unless they are all that's left
+                    stale = missed - drawn
+                    if not stale:
+                        stale, drawn = missed, drawn - missed
+                    seen.discard_many(np.fromiter(stale, dtype=np.int64))
+                    missed, misses = set(), 0
+                continue
+            seen.add(e)
+            drawn.add(e)
+            picked.append(pos)
+            misses = 0
+        return ExercisePool(records=np.array(self.records[picked]))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write a binary exercise bank.")
+    parser.add_argument("path")
+    parser.add_argument("-n", type=int, default=1_000_000, help="number of exercises")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--type", type=int, choices=(1, 2, 3), dest="typ")
+    args = parser.parse_args()
+    write_bank(args.path, args.n, args.seed, typ=args.typ)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,208 @@
+"""Seeded equivalence harness: reference scalar generators vs fast paths.
+
+Fast sampling engines must reproduce the laws of the scalar reference.
+Where a fast path is designed to consume the same random stream, outputs
+are compared exactly under fixed seeds; where it is not, the fast path and
+the reference are both tested for goodness of fit against the exact law of
+the support index (chi-square, p > ALPHA).  A speedup table closes the run.
+
+    python equivalence.py            # exit status 1 if any check fails
+"""
+import argparse
+import math
+import sys
+import time
+from collections import Counter
+
+import numpy as np
+
+from bank import from_record, support_records
+from generators import LAWS, generate_discrete_sample, generate_exercise
+from support import get_index
+
+SEEDS = (0, 1, 2, 12345)
+ALPHA = 1e-3
+
+
+# ─── REFERENCE ───────────────────────────────────────────────────────────────
+def reference_discrete_sample(values, probs, N=1):
+    """The original per-call inverse-CDF loop, kept verbatim as the reference."""
+    cdf, cumul = [], 0.0
+    for p in probs:
+        cumul += p
+        cdf.append(cumul)
+    samples = []
+    for _ in range(N):
+        U, k = np.random.rand(), 0
+        while k < len(values) - 1 and U > cdf[k]:
+            k += 1
+        samples.append(values[k])
+    return samples[0] if N == 1 else np.array(samples)
+
+
+# ─── STATISTICS ──────────────────────────────────────────────────────────────
+def chi2_pvalue(x: float, dof: int) -> float:
+    """Upper tail of the chi-square law (Wilson–Hilferty approximation)."""
+    if dof <= 0:
+        return 1.0
+    h = 2 / (9 * dof)
+    z = ((x / dof) ** (1 / 3) - (1 - h)) / math.sqrt(h)
+    return 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def chi2_gof(counts: dict, probs: dict, min_expected: float = 5.0):
+    """Chi-square goodness of fit of ``counts`` to ``probs`` (category -> p).
+
+    Categories expected fewer than ``min_expected`` times are pooled.
+    Returns (statistic, dof, p-value).
+    """
+    n = sum(counts.values())
+    stat, dof, pool_obs, pool_exp = 0.0, -1, 0, 0.0
+    for cat, p in probs.items():
+        exp, obs = n * p, counts.get(cat, 0)
+        if exp < min_expected:
+            pool_obs, pool_exp = pool_obs + obs, pool_exp + exp
+            continue
+        stat += (obs - exp) ** 2 / exp
+        dof  += 1
+    if pool_exp > 0:
+        stat += (pool_obs - pool_exp) ** 2 / pool_exp
+        dof  += 1
+    stray = sum(c for cat, c in counts.items() if cat not in probs)
+    if stray:
+        return math.inf, dof, 0.0       # outcome outside the support
+    return stat, dof, chi2_pvalue(stat, dof)
+
+
+# ─── CHECKS ──────────────────────────────────────────────────────────────────
+class Harness:
+    def __init__(self, samples: int):
+        self.samples  = samples
+        self.failures = []
+        self.timings  = []              # (name, reference s/op, fast s/op)
+
+    def check(self, name: str, ok: bool, detail: str = "") -> None:
+        print(f"  [{'PASS' if ok else 'FAIL'}] {name}  {detail}")
+        if not ok:
+            self.failures.append(name)
+
+    def exact_discrete_sample(self, n: int = 10_000) -> None:
+        """Batched generate_discrete_sample must match the loop bit for bit."""
+        print("Exact: generate_discrete_sample(N > 1) vs scalar loop")
+        for name, law in LAWS.laws.items():
+            values, probs = law.values, law.probs
+            same = True
+            for seed in SEEDS:
+                np.random.seed(seed)
+                ref = reference_discrete_sample(values, probs, n)
+                np.random.seed(seed)
+                fast = generate_discrete_sample(values, probs, n)
+                same &= bool(np.array_equal(ref, fast))
+            self.check(f"law {name}", same, f"{len(SEEDS)} seeds × {n}")
+
+        values, probs = LAWS["E"].values, LAWS["E"].probs
+        t_ref  = _time(lambda: reference_discrete_sample(values, probs, n)) / n
+        t_fast = _time(lambda: generate_discrete_sample(values, probs, n)) / n
+        self.timings.append(("discrete sample (law E)", t_ref, t_fast))
+
+    def exact_compiled_laws(self, n: int = 10_000) -> None:
+        """Law.draw (compiled spec tables) must match the scalar loop draw for draw."""
+        print("Exact: compiled Law.draw vs scalar loop")
+        for name, law in LAWS.laws.items():
+            same = True
+            for seed in SEEDS:
+                np.random.seed(seed)
+                ref = [reference_discrete_sample(law.values, law.probs) for _ in range(n)]
+                np.random.seed(seed)
+                same &= ref == [law.draw() for _ in range(n)]
+            self.check(f"law {name}", same, f"{len(SEEDS)} seeds × {n}")
+
+        law = LAWS["E"]
+        t_ref  = _time(lambda: [reference_discrete_sample(law.values, law.probs)
+                                for _ in range(n)]) / n
+        t_fast = _time(lambda: [law.draw() for _ in range(n)]) / n
+        self.timings.append(("scalar draw (law E)", t_ref, t_fast))
+
+    def exact_bank_roundtrip(self) -> None:
+        """Bank records must rebuild every support outcome exactly."""
+        print("Exact: bank record round trip over the whole support")
+        index, table = get_index(), support_records()
+        bad = 0
+        for i in range(len(index)):
+            ex, back = index.exercise(i), from_record(table[i])
+            if (ex.equation, ex.typ, ex.nsol, ex.solution.steps) != \
+               (back.equation, back.typ, back.nsol, back.solution.steps):
+                bad += 1
+        self.check("to_record / from_record", bad == 0, f"{bad} mismatches / {len(index)}")
+
+    def distribution_support_sampler(self) -> None:
+        """Scalar generate_exercise and the batched index sampler vs the exact law."""
+        print("Distribution: generate_exercise and SupportIndex.sample_ids vs exact law")
+        index = get_index()
+        # Categories are equations as displayed; distinct outcomes may share one.
+        eq_of = [index.exercise(i).equation for i in range(len(index))]
+        probs = Counter()
+        for eq, p in zip(eq_of, index.prob):
+            probs[eq] += float(p)
+
+        n = self.samples
+        for seed in SEEDS[:2]:
+            np.random.seed(seed)
+            t0  = time.perf_counter()
+            ref = Counter(generate_exercise().equation for _ in range(n))
+            t_ref = (time.perf_counter() - t0) / n
+            stat, dof, p = chi2_gof(ref, probs)
+            self.check(f"generate_exercise seed={seed}", p > ALPHA,
+                       f"chi2={stat:.1f} dof={dof} p={p:.3g}")
+
+            rng = np.random.default_rng(seed)
+            t0  = time.perf_counter()
+            ids = index.sample_ids(n, rng)
+            t_fast = (time.perf_counter() - t0) / n
+            fast = Counter()
+            for i, c in zip(*np.unique(ids, return_counts=True)):
+                fast[eq_of[i]] += int(c)
+            stat, dof, p = chi2_gof(fast, probs)
+            self.check(f"SupportIndex.sample_ids seed={seed}", p > ALPHA,
+                       f"chi2={stat:.1f} dof={dof} p={p:.3g}")
+        self.timings.append(("exercise draw (index ids)", t_ref, t_fast))
+
+    def report(self) -> None:
+        print(f"\n{'path':<28}{'reference/op':>14}{'fast/op':>12}{'speedup':>10}")
+        for name, ref, fast in self.timings:
+            print(f"{name:<28}{_fmt_t(ref):>14}{_fmt_t(fast):>12}{ref / fast:>9.0f}×")
+
+
+def _time(fn, repeat: int = 3) -> float:
+    best = math.inf
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _fmt_t(t: float) -> str:
+    return f"{t * 1e6:.2f} µs" if t >= 1e-6 else f"{t * 1e9:.0f} ns"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Check fast samplers against the reference.")
+    parser.add_argument("--samples", type=int, default=40_000,
+                        help="draws per distributional test")
+    args = parser.parse_args()
+
+    h = Harness(args.samples)
+    h.exact_discrete_sample()
+    h.exact_compiled_laws()
+    h.exact_bank_roundtrip()
+    h.distribution_support_sampler()
+    h.report()
+    if h.failures:
+        print(f"\n{len(h.failures)} check(s) failed: {', '.join(h.failures)}")
+        sys.exit(1)
+    print("\nAll checks passed.")
+
+
+if __name__ == "__main__":
+    main()
@@ -4,9 +4,19 @@ import json
 from fractions import Fraction
 import numpy as np
 
+from laws import load_laws
+from profiling import profiled
+from solutions import build_solution
+
+# Bumped whenever the builders or sampling code change what a seed produces.
+# The laws are identified separately by LAWS.digest (laws.py): seeded output
+# depends on both, and banks and session checkpoints record both.
+GENERATOR_VERSION = 1
+
 # ─── STATS PERSISTENCE ───────────────────────────────────────────────────────
 STATS_PATH = os.path.expanduser("~/.mesim_stats.json")
 
+@profiled("stats.load")
 def load_stats() -> dict:
     """Return persisted session stats, or sensible defaults."""
     try:
@@ -16,6 +26,7 @@ def load_stats() -> dict:
         return {"sessions": 0, "total_score": 0.0,
                 "total_exercises": 0, "best_pct": 0.0}
 
+@profiled("stats.save")
 def save_stats(score: float, total: int) -> None:
     """Append one session's results to the persistent stats file."""
     s = load_stats()
@@ -30,17 +41,20 @@ def save_stats(score: float, total: int) -> None:
 # ─── HELPER: discrete inverse-CDF sampler ────────────────────────────────────
 def generate_discrete_sample(values, probs, N=1):
     """Sample N values from a discrete distribution via inverse-CDF."""
-    cdf, cumul = [], 0.0
-    for p in probs:
-        cumul += p
-        cdf.append(cumul)
-    samples = []
-    for _ in range(N):
+    if N == 1:
+        cdf, cumul = [], 0.0
+        for p in probs:
+            cumul += p
+            cdf.append(cumul)
         U, k = np.random.rand(), 0
         while k < len(values) - 1 and U > cdf[k]:
             k += 1
-        samples.append(values[k])
-    return samples[0] if N == 1 else np.array(samples)
+        return values[k]
+    # Batched path: same uniforms, same CDF, same index as the loop above
+    # (first k with U <= cdf[k]), checked bit-for-bit by equivalence.py
+    cdf = np.cumsum(probs)
+    k   = np.minimum(np.searchsorted(cdf, np.random.rand(N)), len(values) - 1)
+    return np.asarray(values)[k]
 
 # ─── EQUATION FORMATTER ──────────────────────────────────────────────────────
 def _fmt_coef(coef) -> str:
@@ -53,6 +67,7 @@ def _fmt_coef(coef) -> str:
         return str(f)
     return str(round(coef, 4))
 
+@profiled("format_equation")
 def format_equation(a, b, c) -> str:
     """Return a human-readable string for ax² + bx + c = 0."""
 
@@ -72,120 +87,192 @@ def format_equation(a, b, c) -> str:
 
     return fmt(a, "x\u00b2", first=True) + fmt(b, "x") + fmt(c, "") + " = 0"
 
-# ─── EXERCISE GENERATORS ─────────────────────────────────────────────────────
-def _case1():
-    """Type 1 — discriminant < 0 (guaranteed no real root)."""
-    E       = [i for i in range(-9, 10) if i != 0]
-
-    E_small = [1, 2, 3]
-
-    # Probability of full E, equally
-    pe = [1 / len(E)] * len(E)
-
-    # Probability of small E
-    ps = [1 / len(E_small)] * len(E_small)
-    # Generate Discrete sample a, b from full E
-    a = generate_discrete_sample(E, pe)
-    b = generate_discrete_sample(E, pe)
-
-    # Generate Discrete sample c from small E
-    e = generate_discrete_sample(E_small, ps)
+# ─── EXERCISE RECORD ─────────────────────────────────────────────────────────
+class Exercise:
+    """One exercise: grading data computed at creation, display data on first use.
+
+    a, b, c, delta  exact values from the builders (int, Fraction or float)
+    typ             exercise type 1, 2 or 3
+    delta_r         delta rounded to 4 decimals, as shown and graded
+    nsol            number of real solutions (0, 1 or 2)
+    equation        format_equation(a, b, c), built on first access
+    solution        exact step-by-step correction (solutions.Solution),
+                    built on first access
+
+    Iterating yields (a, b, c, delta, typ), so tuple unpacking keeps working.
+    Large pools should hold bank records (bank.py) and build exercises on
+    access; the lazy fields keep those that are never displayed small.
+    """
+    __slots__ = ("a", "b", "c", "delta", "typ",
+                 "delta_r", "nsol", "_equation", "_solution")
+
+    def __init__(self, a, b, c, delta, typ):
+        self.a, self.b, self.c, self.delta, self.typ = a, b, c, delta, typ
+        self.delta_r   = round(delta, 4)
+        self.nsol      = 0 if self.delta_r < 0 else (1 if abs(self.delta_r) < 1e-9 else 2)
+        self._equation = None
+        self._solution = None
+
+    @property
+    def equation(self) -> str:
+        if self._equation is None:
+            self._equation = format_equation(self.a, self.b, self.c)
+        return self._equation
+
+    @property
+    def solution(self):
+        if self._solution is None:
+            self._solution = build_solution(self.a, self.b, self.c)
+        return self._solution
+
+    def __iter__(self):
+        return iter((self.a, self.b, self.c, self.delta, self.typ))
+
+    def __repr__(self):
+        return f"Exercise({self.equation!r}, delta={self.delta_r}, type={self.typ})"
+
+# ─── GRADING ─────────────────────────────────────────────────────────────────
+def grade_answer(ex: Exercise, delta_text: str, nsol_text: str) -> float:
+    """Score one answer: 0.5 for Δ within 0.01, 0.5 for the number of solutions."""
+    score = 0.0
+    try:
+        if abs(float(str(delta_text).replace(",", ".")) - ex.delta_r) < 0.01:
+            score += 0.5
+    except Exception:
+        pass
+    try:
+        if int(nsol_text) == ex.nsol:
+            score += 0.5
+    except Exception:
+        pass
+    return score
+
+# ─── SUPPORT SETS AND LAWS ───────────────────────────────────────────────────
+# Declared in distributions.json (or MESIM_DISTRIBUTIONS), see laws.py
+LAWS = load_laws()
+
+_TYPES, _BRANCH           = LAWS["TYPES"], LAWS["BRANCH"]
+_E, _E_POS, _ELL, _Z      = LAWS["E"], LAWS["E_POS"], LAWS["ELL"], LAWS["Z"]
+_E_TINY, _E_SMALL         = LAWS["E_TINY"], LAWS["E_SMALL"]
+
+# Full set, include negative (cardinal 18)
+E       = _E.values
+# Set contains positive
+E_POS   = _E_POS.values
+# Small set of case 1
+E_TINY  = _E_TINY.values
+# Small set of case 3, include negative
+E_SMALL = _E_SMALL.values
+
+# Probability of each set (uniform in the default spec)
+P_E       = _E.probs
+P_POS     = _E_POS.probs
+P_TINY    = _E_TINY.probs
+P_SMALL   = _E_SMALL.probs
+
+# Probability given in the instruction (case 2, l on E_POS)
+P_ELL     = _ELL.probs
+
+# given probability, P(Z=1)=1/2 (case 3, l on E)
+P_Z       = _Z.probs
+
+# Case 3 branch, rational roots vs surd roots
+BRANCHES  = _BRANCH.values
+P_BRANCH  = _BRANCH.probs
+
+# Set of exercise cases, probabiltiy split type1, 20%, 40%, 40%
+TYPES     = _TYPES.values
+P_TYPES   = _TYPES.probs
+
+# ─── EXERCISE BUILDERS ───────────────────────────────────────────────────────
+# Each builder turns the sampled values of one case into (a, b, c, delta).
+# The generators below and the support index (support.py) share them.
+def build_case1(a, b, e) -> tuple:
+    """Type 1 from a, b in E and e in E_TINY."""
     c = Fraction(int(b**2 + e), 4 * abs(int(a)))
     if a < 0:
         c = -c  # Flip sign so c > b²/(4a)
     delta = Fraction(int(b)**2) - 4 * int(a) * c
     return int(a), int(b), c, delta
 
-def _case2():
-    """Type 2 — discriminant = 0 (one repeated root)."""
-    # Full Set
-    E  = [i for i in range(-9, 10) if i != 0]
-    # Small Set
-    Ep = list(range(1, 10))
-
-    # Probability of full E, equally
-    pe = [1 / len(E)]  * len(E)
-
-    # Probability given in the instruction
-    pl = [1/2, 1/36, 1/36, 1/6, 1/36, 1/36, 1/36, 1/36, 1/6]
-
-    # Generate Discrete sample from full E 
-    e   = generate_discrete_sample(E, pe)
-
-    # Generate Discrete sample from full El with given probab
-    ell = generate_discrete_sample(Ep, pl)
-
+def build_case2(e, ell) -> tuple:
+    """Type 2 from e in E and l in E_POS."""
     # Formula from proejcts
     x0  = e / math.sqrt(ell)
     a, b, c = 1, -2 * x0, x0**2
     return a, b, c, b**2 - 4 * a * c
 
-def _case3():
-    """Type 3 — discriminant > 0 (two distinct real roots)."""
-    # Full Set, include negative
-    E       = [i for i in range(-9, 10) if i != 0]
+def build_case3_rational(h, k, ll) -> tuple:
+    """Type 3, case 1: roots h/l and k/l."""
+    x1, x2 = Fraction(int(h), int(ll)), Fraction(int(k), int(ll))
+    a, b, c = 1, -(x1 + x2), x1 * x2
+    return a, b, c, b**2 - 4*a*c
 
-    # Seet contains positive
-    Ep      = list(range(1, 10))
+def build_case3_surd(h, l, e, p) -> tuple:
+    """Type 3, case 2: roots (-h ± e√p) / l."""
+    # Calculate from the given formula
+    a = l ** 2
+    b = 2 * h * l
+    c = h ** 2 - p * e ** 2
+    return a, b, c, b ** 2 - 4 * a * c
 
-    # Small Set
-    E_small = [i for i in range(-3, 4) if i != 0]
+# ─── EXERCISE GENERATORS ─────────────────────────────────────────────────────
+@profiled("_case1")
+def _case1():
+    """Type 1 — discriminant < 0 (guaranteed no real root)."""
+    # Generate Discrete sample a, b from full E
+    a = _E.draw()
+    b = _E.draw()
 
-    # probability
-    pe  = [1 / len(E)]       * len(E)
-    pEp = [1 / len(Ep)]      * len(Ep)
-    pEs = [1 / len(E_small)] * len(E_small)
+    # Generate Discrete sample c from small E
+    e = _E_TINY.draw()
+    return build_case1(a, b, e)
 
-    # given probability, P(Z=1)=1/2
-    pZ  = [1/2 if i == 1 else 1 / (2 * 17) for i in E]
+@profiled("_case2")
+def _case2():
+    """Type 2 — discriminant = 0 (one repeated root)."""
+    # Generate Discrete sample from full E
+    e   = _E.draw()
 
+    # Generate Discrete sample from full El with given probab
+    ell = _ELL.draw()
+    return build_case2(e, ell)
+
+@profiled("_case3")
+def _case3():
+    """Type 3 — discriminant > 0 (two distinct real roots)."""
     # Case 1
-    if generate_discrete_sample([1, 2], [1/2, 1/2]) == 1:
-        
+    if _BRANCH.draw() == 1:
+
         # h, k random on cardinal 18
-        h  = generate_discrete_sample(E, pe)
-        k  = generate_discrete_sample(E, pe)
+        h  = _E.draw()
+        k  = _E.draw()
 
         # l from Z which given
-        ll = generate_discrete_sample(E, pZ)
-
-        x1, x2 = Fraction(int(h), int(ll)), Fraction(int(k), int(ll))
+        ll = _Z.draw()
+        return build_case3_rational(h, k, ll)
 
     # Case 2
-    else:
-        # Sampling from set E
-        h = generate_discrete_sample(E, pe)
+    # Sampling from set E
+    h = _E.draw()
 
-        # Sampling from set E[-3,-2,-1,1,2,3]
-        l = generate_discrete_sample(E_small, pEs)
+    # Sampling from set E[-3,-2,-1,1,2,3]
+    l = _E_SMALL.draw()
 
-        # Sampling from set E[1....9]
-        e = generate_discrete_sample(Ep, pEp)
-        p = generate_discrete_sample(Ep, pEp)
+    # Sampling from set E[1....9]
+    e = _E_POS.draw()
+    p = _E_POS.draw()
+    return build_case3_surd(h, l, e, p)
 
-        # Calculate from the given formula
-        a = l ** 2
-        b = 2 * h * l
-        c = h ** 2 - p * e ** 2
-        return a, b, c, b ** 2 - 4 * a * c
+@profiled("generate_exercise")
+def generate_exercise() -> Exercise:
+    """Return one Exercise of type_id in {1,2,3} (unpacks as (a, b, c, delta, type_id)).
 
-    a, b, c = 1, -(x1 + x2), x1 * x2
-    return a, b, c, b**2 - 4*a*c
-
-def generate_exercise() -> tuple:
-    """Return one exercise as (a, b, c, delta, type_id) where type_id in {1,2,3}.
-
-    Type probabilities:  1/5  (delta < 0),  2/5  (delta = 0),  2/5  (delta > 0)
+    Type probabilities (default spec):  1/5  (delta < 0),  2/5  (delta = 0),  2/5  (delta > 0)
     """
-    # Set of exercise cases
-    E_set      = [1, 2, 3]
-
-    # Probabiltiy split type1, 20%, 40%, 40%
-    type_probs = [1/5, 2/5, 2/5]
-
     # Generate type of problem
-    typ = generate_discrete_sample(E_set, type_probs)
+    typ = _TYPES.draw()
 
-    if   typ == 1: return (*_case1(), typ)
-    elif typ == 2: return (*_case2(), typ)
-    else:          return (*_case3(), typ)
+    if   typ == 1: return Exercise(*_case1(), typ)
+    elif typ == 2: return Exercise(*_case2(), typ)
+    else:          return Exercise(*_case3(), typ)
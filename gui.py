@@ -1,15 +1,23 @@
-import math
 import os
 import io
+import time
 import tkinter as tk
 import customtkinter as ctk
 
 from generators import (
+    P_TYPES,
     generate_exercise,
-    format_equation,
+    grade_answer,
     load_stats,
     save_stats,
 )
+from bank import BANK_PATH, ExerciseBank
+from lab import LabSampler
+import profiling
+from profiling import profiled
+from seen import SeenSet, draw_fresh
+from session import QuizSession
+import stall_watchdog
 
 # Semantic colours shared between palette-agnostic widgets
 SUCCESS = "#16a34a"   # green-600
@@ -61,6 +69,29 @@ WARNING_BG_D = "#451a03"
 DANGER_BG_L  = "#fef2f2"
 DANGER_BG_D  = "#450a0a"
 
+# ─── FONT CACHE ──────────────────────────────────────────────────────────────
+_FONTS = {}
+
+
+def _font(size: int = 13, weight: str = "normal", family: str = None) -> ctk.CTkFont:
+    """Shared CTkFont for (size, weight, family), created on first use.
+
+    Widgets only read their font, so one Tk font per style serves the whole
+    app and screen rebuilds create none.  Profiling counts fonts created vs
+    reused and times each creation.
+    """
+    key = (size, weight, family)
+    f = _FONTS.get(key)
+    if f is None:
+        t0 = time.perf_counter_ns()
+        f = _FONTS[key] = ctk.CTkFont(family=family, size=size, weight=weight)
+        profiling.record("font.create", time.perf_counter_ns() - t0)
+        profiling.count("font.created")
+    else:
+        profiling.count("font.reused")
+    return f
+
+
 # ─── REUSABLE WIDGETS ────────────────────────────────────────────────────────
 
 class Card(ctk.CTkFrame):
@@ -90,7 +121,7 @@ class PrimaryBtn(ctk.CTkButton):
         kw.setdefault("hover_color", app.c("ACCENT_H"))
         kw.setdefault("text_color",  "#ffffff")
         kw.setdefault("corner_radius", 10)
-        kw.setdefault("font",   ctk.CTkFont(size=14, weight="bold"))
+        kw.setdefault("font",   _font(size=14, weight="bold"))
         kw.setdefault("height", 44)
         super().__init__(master, **kw)
 
@@ -104,7 +135,7 @@ class SecondaryBtn(ctk.CTkButton):
         kw.setdefault("border_width", 1)
         kw.setdefault("border_color", app.c("BORDER"))
         kw.setdefault("corner_radius", 10)
-        kw.setdefault("font",   ctk.CTkFont(size=14))
+        kw.setdefault("font",   _font(size=14))
         kw.setdefault("height", 44)
         super().__init__(master, **kw)
 
@@ -119,7 +150,7 @@ class ModernEntry(ctk.CTkEntry):
         kw.setdefault("text_color",            app.c("FG"))
         kw.setdefault("placeholder_text_color", app.c("TEXT_LOW"))
         kw.setdefault("corner_radius",         10)
-        kw.setdefault("font",   ctk.CTkFont(size=15))
+        kw.setdefault("font",   _font(size=15))
         kw.setdefault("height", 44)
         super().__init__(master, **kw)
 
@@ -155,6 +186,100 @@ class TimerArc(tk.Canvas):
                          fill=self._app.c("FG"), font=("Helvetica", 10, "bold"))
 
 
+class VirtualList(ctk.CTkFrame):
+    """Scrollable list that only draws the rows in view.
+
+    A fixed pool of canvas rows (one more than fits on screen) is recycled
+    as the list scrolls; ``row_fn(i)`` formats row i on demand and returns
+    one (text, color) pair per column.  ``columns`` lists (x, anchor, font)
+    per column, where a negative x is measured from the right edge.
+    """
+    ROW_H = 40
+
+    def __init__(self, master, app, count, row_fn, columns, **kw):
+        kw.setdefault("fg_color",     app.c("SURFACE"))
+        kw.setdefault("corner_radius", 14)
+        kw.setdefault("border_width",  1)
+        kw.setdefault("border_color",  app.c("BORDER"))
+        super().__init__(master, **kw)
+        self._app     = app
+        self._count   = count
+        self._row_fn  = row_fn
+        self._columns = columns
+        self._offset  = 0
+        self._width   = self._height = 1
+        self._slots   = []
+
+        self.canvas = tk.Canvas(self, bg=app.c("SURFACE"), highlightthickness=0)
+        self.canvas.pack(side="left", fill="both", expand=True, padx=(10, 0), pady=10)
+        self.scrollbar = ctk.CTkScrollbar(self, command=self._on_scrollbar,
+                                          button_color=app.c("MUTED_BG"),
+                                          button_hover_color=app.c("BORDER"))
+        self.scrollbar.pack(side="right", fill="y", padx=4, pady=10)
+
+        self.canvas.bind("<Configure>", self._on_resize)
+        for seq in ("<MouseWheel>", "<Button-4>", "<Button-5>"):
+            self.canvas.bind(seq, self._on_wheel)
+
+    # ── Pool ────────────────────────────────────────────────────────────────
+    def _make_slot(self):
+        bg = self.canvas.create_rectangle(0, 0, 0, 0, outline="",
+                                          fill=self._app.c("SURFACE2"))
+        texts = [self.canvas.create_text(0, 0, anchor=anchor, font=font, text="")
+                 for _, anchor, font in self._columns]
+        return bg, texts
+
+    def _on_resize(self, event):
+        self._width, self._height = event.width, event.height
+        needed = self._height // self.ROW_H + 2
+        while len(self._slots) < needed:
+            self._slots.append(self._make_slot())
+        self._render()
+
+    # ── Scrolling ───────────────────────────────────────────────────────────
+    def _max_offset(self):
+        return max(0, self._count * self.ROW_H - self._height)
+
+    def scroll_to(self, offset):
+        self._offset = int(min(max(offset, 0), self._max_offset()))
+        self._render()
+
+    def _on_scrollbar(self, action, value, unit=None):
+        if action == "moveto":
+            self.scroll_to(float(value) * self._count * self.ROW_H)
+        else:
+            step = self._height if unit == "pages" else self.ROW_H
+            self.scroll_to(self._offset + int(value) * step)
+
+    def _on_wheel(self, event):
+        if event.num == 4 or event.delta > 0:
+            self.scroll_to(self._offset - 3 * self.ROW_H)
+        else:
+            self.scroll_to(self._offset + 3 * self.ROW_H)
+
+    # ── Drawing ─────────────────────────────────────────────────────────────
+    def _render(self):
+        first, dy = divmod(self._offset, self.ROW_H)
+        h, w = self.ROW_H, self._width
+        for k, (bg, texts) in enumerate(self._slots):
+            i = first + k
+            if i >= self._count:
+                self.canvas.itemconfigure(bg, state="hidden")
+                for t in texts:
+                    self.canvas.itemconfigure(t, state="hidden")
+                continue
+            y = k * h - dy
+            self.canvas.coords(bg, 0, y + 2, w - 6, y + h - 2)
+            self.canvas.itemconfigure(bg, state="normal")
+            for t, (x, _, _), (text, color) in zip(texts, self._columns, self._row_fn(i)):
+                self.canvas.coords(t, x if x >= 0 else w + x, y + h / 2)
+                self.canvas.itemconfigure(t, state="normal", text=text,
+                                          fill=color or self._app.c("FG"))
+        total = max(self._count * h, 1)
+        self.scrollbar.set(self._offset / total,
+                           min(1.0, (self._offset + self._height) / total))
+
+
 # ─── MAIN APPLICATION ────────────────────────────────────────────────────────
 
 class ProjectMESIMApp(ctk.CTk):
@@ -172,19 +297,23 @@ class ProjectMESIMApp(ctk.CTk):
         ctk.set_default_color_theme("blue")
         self.configure(fg_color=self.c("BG"))
 
-        self.exercises      = []
-        self.current_ex     = 0
-        self.score          = 0.0
+        self.session        = QuizSession()
         self.timer_running  = False
-        self.time_left      = 0
+        self._timer_job     = None
         self.TIMER_MAX      = 120
-        self._ex_results    = []
+        self.TIMER_CHECKPOINT_S = 5
         self._current_screen = "intro"
+        self.no_repeats     = tk.BooleanVar(self, value=False)
+        self._bank          = ExerciseBank(BANK_PATH) if BANK_PATH else None
+        self._lab           = None
+        self._lab_job       = None
 
         self._build_sidebar()
         self._build_main()
         self.show_intro()
 
+        self._watchdog = stall_watchdog.install(self) if stall_watchdog.ENABLED else None
+
     # ── Palette helper ────────────────────────────────────────────────────────
     def c(self, key: str) -> str:
         return (_DARK if self.dark_mode else _LIGHT).get(key, "#ff00ff")
@@ -215,7 +344,7 @@ class ProjectMESIMApp(ctk.CTk):
         self._load_logo(logo_frame)
 
         ctk.CTkLabel(self.sidebar, text="MESIM",
-                     font=ctk.CTkFont(size=11, weight="bold"),
+                     font=_font(size=11, weight="bold"),
                      text_color=self.c("SB_MUTED")).pack(pady=(6, 0))
 
         # Divider
@@ -228,6 +357,7 @@ class ProjectMESIMApp(ctk.CTk):
             ("intro", "⊙", "Introduction"),
             ("quiz",  "✏", "Exercises"),
             ("score", "◈", "Results"),
+            ("lab",   "∿", "Simulation Lab"),
         ]:
             btn_frame = ctk.CTkFrame(self.sidebar, fg_color="transparent",
                                      corner_radius=10)
@@ -235,28 +365,33 @@ class ProjectMESIMApp(ctk.CTk):
             row = ctk.CTkFrame(btn_frame, fg_color="transparent")
             row.pack(fill="x", padx=10, pady=8)
             icon_lbl = ctk.CTkLabel(row, text=icon, width=24,
-                                    font=ctk.CTkFont(size=15),
+                                    font=_font(size=15),
                                     text_color=self.c("SB_MUTED"))
             icon_lbl.pack(side="left")
             text_lbl = ctk.CTkLabel(row, text=label,
-                                    font=ctk.CTkFont(size=13),
+                                    font=_font(size=13),
                                     text_color=self.c("SB_MUTED"), anchor="w")
             text_lbl.pack(side="left", padx=(6, 0))
             self.nav_items[key] = (btn_frame, icon_lbl, text_lbl)
+            for w in (btn_frame, row, icon_lbl, text_lbl):
+                w.configure(cursor="hand2")
+                w.bind("<Button-1>", lambda _, k=key: self._navigate(k))
 
         # Exercise navigator dot grid
         self._dots_section = ctk.CTkFrame(self.sidebar, fg_color="transparent")
         self._dots_section.pack(fill="x", padx=16, pady=(4, 0))
         ctk.CTkLabel(self._dots_section, text="Exercises",
-                     font=ctk.CTkFont(size=10, weight="bold"),
+                     font=_font(size=10, weight="bold"),
                      text_color=self.c("TEXT_LOW")).pack(anchor="w", pady=(0, 6))
-        self._dots_grid = ctk.CTkFrame(self._dots_section, fg_color="transparent")
+        # One canvas, at most DOTS_MAX dots: long drills add no widgets
+        self._dots_grid = tk.Canvas(self._dots_section, width=7 * 32, height=0,
+                                    bg=self.c("SIDEBAR"), highlightthickness=0)
         self._dots_grid.pack(anchor="w")
         self._dots_section.pack_forget()   # hidden until quiz starts
 
         # Footer
         ctk.CTkLabel(self.sidebar, text="ENSIIE · 2026",
-                     font=ctk.CTkFont(size=10),
+                     font=_font(size=10),
                      text_color=self.c("TEXT_LOW")).pack(side="bottom", pady=18)
 
     def _load_logo(self, parent):
@@ -271,7 +406,7 @@ class ProjectMESIMApp(ctk.CTk):
             ctk.CTkLabel(parent, image=self._logo_img, text="").pack()
         except Exception:
             ctk.CTkLabel(parent, text="MESIM",
-                         font=ctk.CTkFont(size=22, weight="bold"),
+                         font=_font(size=22, weight="bold"),
                          text_color=self.c("ACCENT")).pack()
 
     def _set_nav(self, active_key: str):
@@ -281,20 +416,23 @@ class ProjectMESIMApp(ctk.CTk):
                 frame.configure(fg_color=self.c("SB_ACTIVE"))
                 icon_lbl.configure(text_color=self.c("ACCENT"))
                 text_lbl.configure(text_color=self.c("FG"),
-                                   font=ctk.CTkFont(size=13, weight="bold"))
+                                   font=_font(size=13, weight="bold"))
             else:
                 frame.configure(fg_color="transparent")
                 icon_lbl.configure(text_color=self.c("SB_MUTED"))
                 text_lbl.configure(text_color=self.c("SB_MUTED"),
-                                   font=ctk.CTkFont(size=13))
+                                   font=_font(size=13))
+
+    DOTS_MAX = 35
 
     def _update_dots(self, results):
         """Redraw the exercise navigator dots.
 
         results: list where each entry is None (pending) or a float score.
+        Only a window of DOTS_MAX dots around the current exercise is drawn.
         """
-        for w in self._dots_grid.winfo_children():
-            w.destroy()
+        grid = self._dots_grid
+        grid.delete("all")
 
         if not results:
             self._dots_section.pack_forget()
@@ -302,9 +440,15 @@ class ProjectMESIMApp(ctk.CTk):
 
         self._dots_section.pack(fill="x", padx=16, pady=(4, 0))
         done_count = sum(1 for r in results if r is not None)
-        cols = min(len(results), 7)
-
-        for i, r in enumerate(results):
+        cols  = min(len(results), 7)
+        rows  = self.DOTS_MAX // cols
+        # Rows centred on the current exercise, clamped to the first and last
+        last  = max(0, -(-len(results) // cols) - rows)
+        first = max(0, min(done_count // cols - rows // 2, last)) * cols
+        shown = range(first, min(len(results), first + rows * cols))
+
+        for k, i in enumerate(shown):
+            r = results[i]
             if r is None:
                 bg, fg, lbl = self.c("BORDER"), self.c("MUTED"), str(i + 1)
             elif r == 1.0:
@@ -315,32 +459,66 @@ class ProjectMESIMApp(ctk.CTk):
                 bg, fg, lbl = self._danger_bg(), DANGER, "✕"
 
             is_current = (i == done_count)
-            dot = tk.Canvas(self._dots_grid, width=28, height=28,
-                            bg=self.c("SIDEBAR"), highlightthickness=0)
-            dot.grid(row=i // cols, column=i % cols, padx=2, pady=2)
-            dot.create_oval(2, 2, 26, 26,
-                            fill=bg,
-                            outline=self.c("ACCENT") if is_current else bg)
-            dot.create_text(14, 14, text=lbl, fill=fg,
-                            font=("Helvetica", 9, "bold"))
+            x, y = 2 + (k % cols) * 32, 2 + (k // cols) * 32
+            grid.create_oval(x + 2, y + 2, x + 26, y + 26,
+                             fill=bg,
+                             outline=self.c("ACCENT") if is_current else bg)
+            grid.create_text(x + 14, y + 14, text=lbl, fill=fg,
+                             font=("Helvetica", 9, "bold"))
+
+        height = 4 + ((len(shown) + cols - 1) // cols) * 32
+        if len(shown) < len(results):
+            grid.create_text(2, height + 6, anchor="w", fill=self.c("TEXT_LOW"),
+                             text=f"{shown.start + 1}–{shown.stop} of {len(results)}",
+                             font=("Helvetica", 9))
+            height += 16
+        grid.configure(height=height, bg=self.c("SIDEBAR"))
 
     # ── Main content area ─────────────────────────────────────────────────────
     def _build_main(self):
         self.main = ctk.CTkFrame(self, fg_color=self.c("BG"), corner_radius=0)
         self.main.pack(side="left", fill="both", expand=True)
 
+    def _quiz_in_progress(self) -> bool:
+        return 0 < len(self.session.exercises) and \
+            self.session.current_ex < len(self.session.exercises)
+
+    def _navigate(self, key: str):
+        """Sidebar click.  A quiz left for another screen is kept: Exercises
+        returns to its current exercise, Results opens once it is finished."""
+        if key == self._current_screen:
+            return
+        if key == "intro":
+            self.show_intro()
+        elif key == "lab":
+            self.show_lab()
+        elif key == "quiz" and self._quiz_in_progress():
+            self.show_exercise()
+        elif key == "score" and len(self.session.exercises) and not self._quiz_in_progress():
+            if self.session.finished:
+                self.show_summary()
+            else:
+                self._finish_quiz()         # answered through: save the results first
+
     def clear(self):
+        if self.timer_running:
+            self.session.save_time()        # leaving a running exercise
         self.timer_running = False
+        if self._timer_job is not None:
+            self.after_cancel(self._timer_job)
+            self._timer_job = None
+        if self._lab is not None:
+            self._lab.stop()
         for w in self.main.winfo_children():
             w.destroy()
 
     def _page_title(self, parent, title: str, subtitle: str = ""):
         ctk.CTkLabel(parent, text=title,
-                     font=ctk.CTkFont(size=26, weight="bold"),
+                     font=_font(size=26, weight="bold"),
                      text_color=self.c("FG")).pack(anchor="w")
         if subtitle:
             ctk.CTkLabel(parent, text=subtitle,
-                         font=ctk.CTkFont(size=13),
+                         font=_font(size=13),
                          text_color=self.c("TEXT_MED")).pack(anchor="w", pady=(2, 0))
         ctk.CTkFrame(parent, height=1,
                      fg_color=self.c("BORDER")).pack(fill="x", pady=(14, 20))
@@ -348,12 +526,13 @@ class ProjectMESIMApp(ctk.CTk):
     def _pill(self, parent, text: str, fg: str, text_color: str):
         f = ctk.CTkFrame(parent, fg_color=fg, corner_radius=20)
         f.pack(side="left", padx=(0, 8))
-        ctk.CTkLabel(f, text=text, font=ctk.CTkFont(size=11),
+        ctk.CTkLabel(f, text=text, font=_font(size=11),
                      text_color=text_color).pack(padx=12, pady=5)
 
     # ═════════════════════════════════════════════════════════════════════════
     # SCREEN 1 — INTRODUCTION
     # ═════════════════════════════════════════════════════════════════════════
+    @profiled("screen.show_intro")
     def show_intro(self):
         self.clear()
         self._set_nav("intro")
@@ -379,7 +558,7 @@ class ProjectMESIMApp(ctk.CTk):
             sc_inner = ctk.CTkFrame(sc, fg_color="transparent")
             sc_inner.pack(fill="x", padx=20, pady=14)
             ctk.CTkLabel(sc_inner, text="Your stats",
-                         font=ctk.CTkFont(size=12, weight="bold"),
+                         font=_font(size=12, weight="bold"),
                          text_color=self.c("TEXT_LOW")).pack(anchor="w", pady=(0, 10))
             row = ctk.CTkFrame(sc_inner, fg_color="transparent")
             row.pack(fill="x")
@@ -394,7 +573,7 @@ class ProjectMESIMApp(ctk.CTk):
                 chip = ctk.CTkFrame(row, fg_color=self.c("SURFACE2"), corner_radius=8)
                 chip.pack(side="left", padx=(0, 8))
                 ctk.CTkLabel(chip, text=label,
-                             font=ctk.CTkFont(size=12, weight="bold"),
+                             font=_font(size=12, weight="bold"),
                              text_color=self.c("FG")).pack(padx=12, pady=6)
 
         # ── Theory card ───────────────────────────────────────────────────
@@ -408,14 +587,14 @@ class ProjectMESIMApp(ctk.CTk):
                              border_color="#fecdd3" if not self.dark_mode else "#7f1d1d")
         badge.pack(fill="x", pady=(0, 16))
         ctk.CTkLabel(badge, text="ax\u00b2 + bx + c = 0",
-                     font=ctk.CTkFont(size=20, weight="bold", family="Courier"),
+                     font=_font(size=20, weight="bold", family="Courier"),
                      text_color=self.c("ACCENT")).pack(pady=14)
 
         ctk.CTkLabel(t_inner, text="Discriminant",
-                     font=ctk.CTkFont(size=12, weight="bold"),
+                     font=_font(size=12, weight="bold"),
                      text_color=self.c("TEXT_LOW")).pack(anchor="w")
         ctk.CTkLabel(t_inner, text="\u0394  =  b\u00b2 \u2212 4ac",
-                     font=ctk.CTkFont(size=16, weight="bold", family="Courier"),
+                     font=_font(size=16, weight="bold", family="Courier"),
                      text_color=self.c("FG")).pack(anchor="w", pady=(2, 14))
 
         for disc, desc, col, bg in [
@@ -431,25 +610,42 @@ class ProjectMESIMApp(ctk.CTk):
             ri = ctk.CTkFrame(r, fg_color="transparent")
             ri.pack(fill="x", padx=16, pady=10)
             ctk.CTkLabel(ri, text=disc,
-                         font=ctk.CTkFont(size=13, weight="bold", family="Courier"),
+                         font=_font(size=13, weight="bold", family="Courier"),
                          text_color=col, width=60, anchor="w").pack(side="left")
             ctk.CTkLabel(ri, text="\u2192",
-                         font=ctk.CTkFont(size=13),
+                         font=_font(size=13),
                          text_color=self.c("TEXT_LOW")).pack(side="left", padx=8)
             ctk.CTkLabel(ri, text=desc,
-                         font=ctk.CTkFont(size=13),
+                         font=_font(size=13),
                          text_color=self.c("FG"), anchor="w").pack(side="left")
 
+        # ── Unfinished quiz ───────────────────────────────────────────────
+        pending = QuizSession.peek()
+        if pending:
+            answered, total = pending
+            rc = TintCard(scroll, self)
+            rc.pack(fill="x", pady=(0, 18))
+            rc_inner = ctk.CTkFrame(rc, fg_color="transparent")
+            rc_inner.pack(fill="x", padx=24, pady=16)
+            done = answered >= total            # closed before its results were saved
+            ctk.CTkLabel(rc_inner, text=(f"Finished quiz  ·  {total} answered, results not saved"
+                                         if done else
+                                         f"Unfinished quiz  ·  {answered} / {total} answered"),
+                         font=_font(size=14, weight="bold"),
+                         text_color=self.c("FG")).pack(side="left")
+            PrimaryBtn(rc_inner, self, text="See results  \u2192" if done else "Resume  \u2192",
+                       width=150, command=self.resume_quiz).pack(side="right")
+
         # ── Config card ───────────────────────────────────────────────────
         cfg = Card(scroll, self)
         cfg.pack(fill="x", pady=(0, 18))
         cfg_inner = ctk.CTkFrame(cfg, fg_color="transparent")
         cfg_inner.pack(padx=24, pady=20, fill="x")
         ctk.CTkLabel(cfg_inner, text="Configure your session",
-                     font=ctk.CTkFont(size=15, weight="bold"),
+                     font=_font(size=15, weight="bold"),
                      text_color=self.c("FG")).pack(anchor="w", pady=(0, 4))
         ctk.CTkLabel(cfg_inner, text="Choose how many exercises to generate",
-                     font=ctk.CTkFont(size=12),
+                     font=_font(size=12),
                      text_color=self.c("TEXT_LOW")).pack(anchor="w", pady=(0, 14))
 
         row = ctk.CTkFrame(cfg_inner, fg_color="transparent")
@@ -461,15 +657,25 @@ class ProjectMESIMApp(ctk.CTk):
         self.num_entry.bind("<Return>", lambda _: self.start_quiz())
         PrimaryBtn(row, self, text="Start Quiz  \u2192", width=160,
                    command=self.start_quiz).pack(side="left")
+        ctk.CTkCheckBox(cfg_inner, text="Avoid exercises seen in earlier sessions",
+                        variable=self.no_repeats,
+                        font=_font(size=12),
+                        text_color=self.c("TEXT_MED"),
+                        fg_color=self.c("ACCENT"),
+                        hover_color=self.c("ACCENT_H"),
+                        border_color=self.c("BORDER"),
+                        checkbox_width=18, checkbox_height=18,
+                        corner_radius=5).pack(anchor="w", pady=(12, 0))
 
         # ── Type distribution pills ───────────────────────────────────────
         pill_row = ctk.CTkFrame(scroll, fg_color="transparent")
         pill_row.pack(anchor="w", pady=(0, 10))
-        self._pill(pill_row, "Type 1 · \u0394 < 0 · 20%",
+        p1, p2, p3 = P_TYPES                # from the laws spec
+        self._pill(pill_row, f"Type 1 · \u0394 < 0 · {p1:.0%}",
                    fg=self._danger_bg(),  text_color=DANGER)
-        self._pill(pill_row, "Type 2 · \u0394 = 0 · 40%",
+        self._pill(pill_row, f"Type 2 · \u0394 = 0 · {p2:.0%}",
                    fg=self._warning_bg(), text_color=WARNING)
-        self._pill(pill_row, "Type 3 · \u0394 > 0 · 40%",
+        self._pill(pill_row, f"Type 3 · \u0394 > 0 · {p3:.0%}",
                    fg=self._success_bg(), text_color=SUCCESS)
 
     # ═════════════════════════════════════════════════════════════════════════
@@ -484,23 +690,46 @@ class ProjectMESIMApp(ctk.CTk):
             self.num_entry.insert(0, "5")
             self.num_entry.flash_error()
             return
-        self.exercises   = [generate_exercise() for _ in range(n)]
-        self.current_ex  = 0
-        self.score       = 0.0
-        self._ex_results = [None] * n
+        if self.no_repeats.get():
+            seen = SeenSet.load()
+            if self._bank is not None:
+                exercises = self._bank.draw_fresh(n, seen)
+            else:
+                exercises = draw_fresh(n, seen)
+            seen.save()
+        elif self._bank is not None:
+            exercises = self._bank.draw(n)
+        else:
+            exercises = [generate_exercise() for _ in range(n)]
+        self.session.close()
+        self.session = QuizSession.start(exercises)
         self.show_exercise()
 
+    def resume_quiz(self):
+        self.session.close()
+        try:
+            self.session = QuizSession.load()
+        except Exception:
+            self.session = QuizSession()
+            self.show_intro()
+            return
+        if self.session.complete:
+            self._finish_quiz()
+        else:
+            self.show_exercise()
+
+    @profiled("screen.show_exercise")
     def show_exercise(self):
         self.clear()
         self._set_nav("quiz")
         self.timer_running = True
-        self.time_left     = self.TIMER_MAX
-        self._update_dots(self._ex_results)
+        if self.session.time_left is None:  # else resumed: keep the saved time
+            self.session.time_left = self.TIMER_MAX
+        self._update_dots(self.session.results)
 
-        a, b, c, delta, typ = self.exercises[self.current_ex]
-        delta = round(delta, 4)
-        total = len(self.exercises)
-        idx   = self.current_ex + 1
+        ex    = self.session.exercises[self.session.current_ex]
+        total = len(self.session.exercises)
+        idx   = self.session.current_ex + 1
 
         outer = ctk.CTkFrame(self.main, fg_color="transparent")
         outer.pack(fill="both", expand=True, padx=36, pady=28)
@@ -511,10 +740,10 @@ class ProjectMESIMApp(ctk.CTk):
         left = ctk.CTkFrame(topbar, fg_color="transparent")
         left.pack(side="left", fill="y")
         ctk.CTkLabel(left, text=f"Exercise {idx} / {total}",
-                     font=ctk.CTkFont(size=18, weight="bold"),
+                     font=_font(size=18, weight="bold"),
                      text_color=self.c("FG")).pack(anchor="w")
         ctk.CTkLabel(left, text="Compute \u0394 and count the solutions",
-                     font=ctk.CTkFont(size=12),
+                     font=_font(size=12),
                      text_color=self.c("TEXT_LOW")).pack(anchor="w")
 
         timer_wrap = ctk.CTkFrame(topbar, fg_color=self.c("SURFACE"),
@@ -541,15 +770,15 @@ class ProjectMESIMApp(ctk.CTk):
         eq_row = ctk.CTkFrame(eq_in, fg_color="transparent")
         eq_row.pack(fill="x")
         ctk.CTkLabel(eq_row, text="Solve:",
-                     font=ctk.CTkFont(size=12),
+                     font=_font(size=12),
                      text_color=self.c("TEXT_MED")).pack(side="left", padx=(0, 12))
-        ctk.CTkLabel(eq_row, text=format_equation(a, b, c),
-                     font=ctk.CTkFont(size=24, weight="bold", family="Courier"),
+        ctk.CTkLabel(eq_row, text=ex.equation,
+                     font=_font(size=24, weight="bold", family="Courier"),
                      text_color=self.c("ACCENT")).pack(side="left")
         badge = ctk.CTkFrame(eq_in, fg_color=self.c("MUTED_BG"), corner_radius=20)
         badge.pack(anchor="w", pady=(10, 0))
-        ctk.CTkLabel(badge, text=f"  Type {typ}  ·  1 point  ",
-                     font=ctk.CTkFont(size=11),
+        ctk.CTkLabel(badge, text=f"  Type {ex.typ}  ·  1 point  ",
+                     font=_font(size=11),
                      text_color=self.c("TEXT_MED")).pack(padx=4, pady=4)
 
         # Answer inputs
@@ -558,7 +787,7 @@ class ProjectMESIMApp(ctk.CTk):
         ans_in = ctk.CTkFrame(ans_card, fg_color="transparent")
         ans_in.pack(padx=24, pady=20, fill="x")
         ctk.CTkLabel(ans_in, text="Your answers",
-                     font=ctk.CTkFont(size=14, weight="bold"),
+                     font=_font(size=14, weight="bold"),
                      text_color=self.c("FG")).pack(anchor="w", pady=(0, 14))
 
         entries = []
@@ -570,12 +799,12 @@ class ProjectMESIMApp(ctk.CTk):
             q_row.pack(fill="x", pady=5)
             q_inner = ctk.CTkFrame(q_row, fg_color="transparent")
             q_inner.pack(fill="x", padx=16, pady=12)
-            ctk.CTkLabel(q_inner, text=q_text, font=ctk.CTkFont(size=13),
+            ctk.CTkLabel(q_inner, text=q_text, font=_font(size=13),
                          text_color=self.c("FG"), anchor="w").pack(
                          side="left", expand=True, fill="x")
             pts_f = ctk.CTkFrame(q_inner, fg_color=self.c("MUTED_BG"), corner_radius=20)
             pts_f.pack(side="left", padx=(8, 12))
-            ctk.CTkLabel(pts_f, text=pts, font=ctk.CTkFont(size=10),
+            ctk.CTkLabel(pts_f, text=pts, font=_font(size=10),
                          text_color=self.c("TEXT_MED")).pack(padx=8, pady=3)
             entry = ModernEntry(q_inner, self, width=150, placeholder_text=ph)
             entry.pack(side="left")
@@ -622,58 +851,44 @@ class ProjectMESIMApp(ctk.CTk):
 
     def _skip(self):
         self.timer_running = False
-        a, b, c, delta, _ = self.exercises[self.current_ex]
-        delta = round(delta, 4)
-        nsol = 0 if delta < 0 else (1 if abs(delta) < 1e-9 else 2)
-        self._ex_results[self.current_ex] = 0.0
-        self.show_correction(a, b, c, delta, nsol, 0.0)
+        self.session.record(0.0)
+        self.show_correction(self.session.exercises[self.session.current_ex], 0.0)
 
     def run_timer(self):
         if not self.timer_running:
             return
-        frac = self.time_left / self.TIMER_MAX
-        mins = self.time_left // 60
-        secs = self.time_left % 60
+        frac = self.session.time_left / self.TIMER_MAX
+        mins = self.session.time_left // 60
+        secs = self.session.time_left % 60
         try:
             self.timer_arc.update_timer(frac, f"{mins}:{secs:02d}")
         except Exception:
             return
-        if self.time_left > 0:
-            self.time_left -= 1
-            self.after(1000, self.run_timer)
+        if self.session.time_left > 0:
+            self.session.time_left -= 1
+            if self.session.time_left % self.TIMER_CHECKPOINT_S == 0:
+                self.session.save_time()
+            self._timer_job = self.after(1000, self.run_timer)
         else:
             self.timer_running = False
             self.try_submit()
 
     def check_answer(self):
         self.timer_running = False
-        a, b, c, delta, _ = self.exercises[self.current_ex]
-        delta = round(delta, 4)
-        correct_nsol = 0 if delta < 0 else (1 if abs(delta) < 1e-9 else 2)
+        ex = self.session.exercises[self.session.current_ex]
+        ex_score = grade_answer(ex, self.delta_entry.get(), self.nsol_entry.get())
 
-        ex_score = 0.0
-        try:
-            if abs(float(self.delta_entry.get().replace(",", ".")) - delta) < 0.01:
-                ex_score += 0.5
-        except Exception:
-            pass
-        try:
-            if int(self.nsol_entry.get()) == correct_nsol:
-                ex_score += 0.5
-        except Exception:
-            pass
-
-        self.score += ex_score
-        self._ex_results[self.current_ex] = ex_score
-        self.show_correction(a, b, c, delta, correct_nsol, ex_score)
+        self.session.record(ex_score)
+        self.show_correction(ex, ex_score)
 
     # ═════════════════════════════════════════════════════════════════════════
     # SCREEN 3 — CORRECTION
     # ═════════════════════════════════════════════════════════════════════════
-    def show_correction(self, a, b, c, delta, correct_nsol, ex_score):
+    @profiled("screen.show_correction")
+    def show_correction(self, ex, ex_score):
         self.clear()
         self._set_nav("quiz")
-        self._update_dots(self._ex_results)
+        self._update_dots(self.session.results)
 
         scroll = ctk.CTkScrollableFrame(self.main, fg_color="transparent",
                                         scrollbar_button_color=self.c("MUTED_BG"))
@@ -682,8 +897,8 @@ class ProjectMESIMApp(ctk.CTk):
         # Header
         hdr = ctk.CTkFrame(scroll, fg_color="transparent")
         hdr.pack(fill="x", pady=(0, 4))
-        ctk.CTkLabel(hdr, text=f"Exercise {self.current_ex + 1}  ·  Correction",
-                     font=ctk.CTkFont(size=22, weight="bold"),
+        ctk.CTkLabel(hdr, text=f"Exercise {self.session.current_ex + 1}  ·  Correction",
+                     font=_font(size=22, weight="bold"),
                      text_color=self.c("FG")).pack(side="left")
 
         if   ex_score == 1.0: sc_bg, sc_fg = self._success_bg(), SUCCESS
@@ -693,7 +908,7 @@ class ProjectMESIMApp(ctk.CTk):
                           border_width=1, border_color=sc_fg)
         sb.pack(side="right")
         ctk.CTkLabel(sb, text=f"  {ex_score} / 1 pt  ",
-                     font=ctk.CTkFont(size=13, weight="bold"),
+                     font=_font(size=13, weight="bold"),
                      text_color=sc_fg).pack(padx=6, pady=6)
 
         ctk.CTkFrame(scroll, height=1, fg_color=self.c("BORDER")).pack(
@@ -702,8 +917,8 @@ class ProjectMESIMApp(ctk.CTk):
         # Equation
         eq_card = TintCard(scroll, self)
         eq_card.pack(fill="x", pady=(0, 12))
-        ctk.CTkLabel(eq_card, text=format_equation(a, b, c),
-                     font=ctk.CTkFont(size=22, weight="bold", family="Courier"),
+        ctk.CTkLabel(eq_card, text=ex.equation,
+                     font=_font(size=22, weight="bold", family="Courier"),
                      text_color=self.c("ACCENT")).pack(padx=24, pady=18)
 
         # Step-by-step results
@@ -712,7 +927,7 @@ class ProjectMESIMApp(ctk.CTk):
         res_in = ctk.CTkFrame(res_card, fg_color="transparent")
         res_in.pack(padx=24, pady=18, fill="x")
         ctk.CTkLabel(res_in, text="Step-by-step solution",
-                     font=ctk.CTkFont(size=13, weight="bold"),
+                     font=_font(size=13, weight="bold"),
                      text_color=self.c("TEXT_LOW")).pack(anchor="w", pady=(0, 12))
 
         def result_row(label, value, val_color=None):
@@ -721,36 +936,27 @@ class ProjectMESIMApp(ctk.CTk):
             r.pack(fill="x", pady=3)
             ri = ctk.CTkFrame(r, fg_color="transparent")
             ri.pack(fill="x", padx=14, pady=9)
-            ctk.CTkLabel(ri, text=label, font=ctk.CTkFont(size=13),
+            ctk.CTkLabel(ri, text=label, font=_font(size=13),
                          text_color=self.c("TEXT_MED"), anchor="w",
                          width=200).pack(side="left")
             ctk.CTkLabel(ri, text=value,
-                         font=ctk.CTkFont(size=13, weight="bold", family="Courier"),
+                         font=_font(size=13, weight="bold", family="Courier"),
                          text_color=color).pack(side="left")
 
-        result_row("Discriminant  \u0394 =", str(delta))
-        result_row("Number of solutions:", str(correct_nsol))
-        if correct_nsol == 1:
-            x0 = round(-b / (2 * a), 6)
-            result_row("Solution:", f"x\u2080 = {x0}", SUCCESS)
-        elif correct_nsol == 2:
-            sq = math.sqrt(abs(delta))
-            x1 = round((-b - sq) / (2 * a), 6)
-            x2 = round((-b + sq) / (2 * a), 6)
-            result_row("Solutions:", f"x\u2081 = {x1}", SUCCESS)
-            result_row("",           f"x\u2082 = {x2}", SUCCESS)
-
-        self.current_ex += 1
-        remaining = len(self.exercises) - self.current_ex
+        for label, value, is_result in ex.solution.steps:
+            result_row(label, value, SUCCESS if is_result else None)
+
+        self.session.current_ex += 1
+        remaining = len(self.session.exercises) - self.session.current_ex
         ctk.CTkLabel(scroll,
-                     text=f"Running total: {round(self.score, 2)} / {self.current_ex}"
+                     text=f"Running total: {round(self.session.score, 2)} / {self.session.current_ex}"
                           f"   ·   {remaining} exercise{'s' if remaining != 1 else ''} remaining",
-                     font=ctk.CTkFont(size=12),
+                     font=_font(size=12),
                      text_color=self.c("TEXT_LOW")).pack(anchor="w", pady=(6, 18))
 
         btn_row = ctk.CTkFrame(scroll, fg_color="transparent")
         btn_row.pack(fill="x")
-        if self.current_ex < len(self.exercises):
+        if self.session.current_ex < len(self.session.exercises):
             PrimaryBtn(btn_row, self, text="Next Exercise  \u2192", width=190,
                        command=self.show_exercise).pack(side="right")
         else:
@@ -758,24 +964,26 @@ class ProjectMESIMApp(ctk.CTk):
                        command=self._finish_quiz).pack(side="right")
 
     def _finish_quiz(self):
-        save_stats(self.score, len(self.exercises))
+        save_stats(self.session.score, len(self.session.exercises))
+        self.session.finish()
         self.show_summary()
 
     # ═════════════════════════════════════════════════════════════════════════
     # SCREEN 4 — SUMMARY
     # ═════════════════════════════════════════════════════════════════════════
+    @profiled("screen.show_summary")
     def show_summary(self):
         self.clear()
         self._set_nav("score")
-        self._update_dots(self._ex_results)
+        self._update_dots(self.session.results)
 
         outer = ctk.CTkFrame(self.main, fg_color="transparent")
         outer.pack(fill="both", expand=True, padx=48, pady=36)
 
         self._page_title(outer, "Quiz Complete", "Here's how you did")
 
-        total = len(self.exercises)
-        score = round(self.score, 2)
+        total = len(self.session.exercises)
+        score = round(self.session.score, 2)
         pct   = (score / total * 100) if total else 0
         ring_color = SUCCESS if pct >= 80 else WARNING if pct >= 50 else DANGER
 
@@ -814,7 +1022,7 @@ class ProjectMESIMApp(ctk.CTk):
         elif pct >= 50: verdict, v_col = "Good effort!", WARNING
         else:           verdict, v_col = "Keep practicing!", DANGER
         ctk.CTkLabel(outer, text=verdict,
-                     font=ctk.CTkFont(size=24, weight="bold"),
+                     font=_font(size=24, weight="bold"),
                      text_color=v_col).pack(pady=(0, 20))
 
         sc = Card(outer, self)
@@ -830,10 +1038,10 @@ class ProjectMESIMApp(ctk.CTk):
             r.pack(fill="x", pady=4)
             ri = ctk.CTkFrame(r, fg_color="transparent")
             ri.pack(fill="x", padx=16, pady=10)
-            ctk.CTkLabel(ri, text=label, font=ctk.CTkFont(size=13),
+            ctk.CTkLabel(ri, text=label, font=_font(size=13),
                          text_color=self.c("TEXT_MED"), anchor="w").pack(side="left")
             ctk.CTkLabel(ri, text=value,
-                         font=ctk.CTkFont(size=14, weight="bold"),
+                         font=_font(size=14, weight="bold"),
                          text_color=self.c("FG"), anchor="e").pack(side="right")
 
         btn_row = ctk.CTkFrame(outer, fg_color="transparent")
@@ -842,3 +1050,164 @@ class ProjectMESIMApp(ctk.CTk):
                    command=self.show_intro).pack(side="right")
         SecondaryBtn(btn_row, self, text="Back to Intro", width=160,
                      command=self.show_intro).pack(side="right", padx=(0, 10))
+        SecondaryBtn(btn_row, self, text="Review answers", width=160,
+                     command=self.show_review).pack(side="right", padx=(0, 10))
+
+    # ═════════════════════════════════════════════════════════════════════════
+    # SCREEN 5 — REVIEW
+    # ═════════════════════════════════════════════════════════════════════════
+    @profiled("screen.show_review")
+    def show_review(self):
+        self.clear()
+        self._set_nav("score")
+        self._update_dots(self.session.results)
+
+        outer = ctk.CTkFrame(self.main, fg_color="transparent")
+        outer.pack(fill="both", expand=True, padx=36, pady=28)
+
+        total = len(self.session.exercises)
+        self._page_title(outer, "Review",
+                         f"{total} exercise{'s' if total != 1 else ''}  ·  "
+                         f"{round(self.session.score, 2)} / {total} pts")
+
+        btn_row = ctk.CTkFrame(outer, fg_color="transparent")
+        btn_row.pack(side="bottom", fill="x", pady=(14, 0))
+        PrimaryBtn(btn_row, self, text="Back to Results", width=170,
+                   command=self.show_summary).pack(side="right")
+
+        mono = ("Courier", 13, "bold")
+        VirtualList(outer, self, total, self._review_row, columns=[
+            (12,   "w", ("Helvetica", 11)),
+            (56,   "w", mono),
+            (-230, "w", mono),
+            (-100, "w", ("Helvetica", 12)),
+            (-16,  "e", ("Helvetica", 12, "bold")),
+        ]).pack(fill="both", expand=True)
+
+    def _review_row(self, i):
+        """Format review row i lazily from the exercise and its result."""
+        ex, r = self.session.exercises[i], self.session.results[i]
+        if r is None:   mark, col = "—",     self.c("MUTED")
+        elif r == 1.0:  mark, col = "✓  1",  SUCCESS
+        elif r == 0.5:  mark, col = "½  0.5", WARNING
+        else:           mark, col = "✕  0",  DANGER
+        return [
+            (str(i + 1),                 self.c("TEXT_LOW")),
+            (ex.equation,                self.c("ACCENT")),
+            (f"\u0394 = {ex.solution.delta}", None),
+            (f"{ex.nsol} solution{'s' if ex.nsol != 1 else ''}", self.c("TEXT_MED")),
+            (mark,                       col),
+        ]
+
+    # ═════════════════════════════════════════════════════════════════════════
+    # SCREEN 6 — SIMULATION LAB
+    # ═════════════════════════════════════════════════════════════════════════
+    LAB_REDRAW_MS = 250
+    LAB_MODES     = {"generate_exercise": "generator", "Exact-law sampler": "exact"}
+    HIST_W, HIST_H = 320, 150
+
+    @profiled("screen.show_lab")
+    def show_lab(self):
+        self.clear()
+        self._set_nav("lab")
+        self._dots_section.pack_forget()
+        if self._lab is None:
+            self._lab = LabSampler()
+
+        scroll = ctk.CTkScrollableFrame(self.main, fg_color="transparent",
+                                        scrollbar_button_color=self.c("MUTED_BG"))
+        scroll.pack(fill="both", expand=True, padx=36, pady=28)
+
+        self._page_title(scroll, "Simulation Lab",
+                         "Monte Carlo sampling of the exercise law against exact probabilities")
+
+        bar = ctk.CTkFrame(scroll, fg_color="transparent")
+        bar.pack(fill="x", pady=(0, 6))
+        self._lab_btn = PrimaryBtn(bar, self, text="Pause", width=110,
+                                   command=self._toggle_lab)
+        self._lab_btn.pack(side="left")
+        SecondaryBtn(bar, self, text="Reset", width=100,
+                     command=self._lab.reset).pack(side="left", padx=(10, 0))
+        mode = ctk.CTkSegmentedButton(bar, values=list(self.LAB_MODES),
+                                      font=_font(size=12),
+                                      selected_color=self.c("ACCENT"),
+                                      selected_hover_color=self.c("ACCENT_H"),
+                                      command=lambda v: self._lab.set_mode(self.LAB_MODES[v]))
+        mode.set(next(k for k, v in self.LAB_MODES.items() if v == self._lab.mode))
+        mode.pack(side="left", padx=(10, 0))
+        back = ("\u2190  Back to quiz", self.show_exercise) if self._quiz_in_progress() \
+            else ("\u2190  Back", self.show_intro)
+        SecondaryBtn(bar, self, text=back[0], width=150,
+                     command=back[1]).pack(side="right")
+
+        self._lab_stats = ctk.CTkLabel(scroll, text="", justify="left",
+                                       font=_font(size=12, family="Courier"),
+                                       text_color=self.c("TEXT_MED"))
+        self._lab_stats.pack(anchor="w", pady=(6, 4))
+        ctk.CTkLabel(scroll, text="Bars: empirical frequency   ·   Ticks: exact probability",
+                     font=_font(size=11),
+                     text_color=self.c("TEXT_LOW")).pack(anchor="w", pady=(0, 12))
+
+        grid = ctk.CTkFrame(scroll, fg_color="transparent")
+        grid.pack(fill="x")
+        grid.grid_columnconfigure((0, 1), weight=1)
+        self._lab_canvases = []
+        for i, (title, *_) in enumerate(self._lab.specs):
+            card = Card(grid, self)
+            card.grid(row=i // 2, column=i % 2, sticky="nsew",
+                      padx=(0, 12) if i % 2 == 0 else 0, pady=(0, 12))
+            ctk.CTkLabel(card, text=title,
+                         font=_font(size=13, weight="bold"),
+                         text_color=self.c("FG")).pack(anchor="w", padx=16, pady=(12, 0))
+            cv = tk.Canvas(card, width=self.HIST_W, height=self.HIST_H,
+                           bg=self.c("SURFACE"), highlightthickness=0)
+            cv.pack(padx=12, pady=(4, 12))
+            self._lab_canvases.append(cv)
+
+        self._lab.start()
+        self._redraw_lab()
+
+    def _toggle_lab(self):
+        if self._lab.running:
+            self._lab.stop()
+            self._lab_btn.configure(text="Resume")
+        else:
+            self._lab.start()
+            self._lab_btn.configure(text="Pause")
+            self._redraw_lab()
+
+    def _redraw_lab(self):
+        """Throttled redraw: runs every LAB_REDRAW_MS while the sampler runs."""
+        if self._lab_job is not None:
+            self.after_cancel(self._lab_job)
+            self._lab_job = None
+        if self._current_screen != "lab":
+            return
+        snap = self._lab.snapshot()
+        self._lab_stats.configure(text=(
+            f"{snap['n']:,} samples   ·   {snap['rate'] / 1e6:.2f} M samples/s\n"
+            f"E[\u0394]   = {snap['mean']:10.3f}   (exact {self._lab.exact_mean:10.3f})\n"
+            f"Var[\u0394] = {snap['variance']:10.1f}   (exact {self._lab.exact_var:10.1f})"))
+        for cv, (_, labels, emp, exact) in zip(self._lab_canvases, snap["hists"]):
+            self._draw_histogram(cv, labels, emp, exact)
+        if self._lab.running:
+            self._lab_job = self.after(self.LAB_REDRAW_MS, self._redraw_lab)
+
+    def _draw_histogram(self, cv, labels, emp, exact):
+        w, h, base = self.HIST_W, self.HIST_H, self.HIST_H - 18
+        n     = len(labels)
+        bw    = (w - 8) / n
+        top   = max(emp.max(), exact.max(), 1e-12) * 1.1
+        every = -(-n // 9)          # show at most ~9 tick labels
+        cv.delete("all")
+        cv.create_line(4, base, w - 4, base, fill=self.c("BORDER"))
+        for i in range(n):
+            x0 = 4 + i * bw
+            y  = base - emp[i] / top * (base - 6)
+            ye = base - exact[i] / top * (base - 6)
+            cv.create_rectangle(x0 + 1, y, x0 + bw - 1, base,
+                                fill=self.c("ACCENT"), outline="")
+            cv.create_line(x0, ye, x0 + bw, ye, fill=self.c("FG"), width=2)
+            if i % every == 0 or i == n - 1:
+                cv.create_text(x0 + bw / 2, base + 9, text=labels[i],
+                               fill=self.c("TEXT_LOW"), font=("Helvetica", 8))
@@ -0,0 +1,228 @@
+"""Streaming Monte Carlo of the ``generate_exercise`` law for the Simulation Lab.
+
+A background thread draws exercises in chunks and folds them into online
+accumulators — a histogram per attribute (type, a, b, c, Δ) and the running
+moments of Δ — which are compared at redraw time with the exact
+probabilities of the support index.  Two modes:
+
+    generator  real ``generate_exercise`` draws: any drift between the
+               generators and the exact law shows up on screen
+    exact      inverse-CDF over the support index probabilities, millions
+               of samples per second, but checks only the sampler itself
+
+``generate_exercise`` is scalar Python, tens of thousands of draws per
+second per core, so generator mode runs it in WORKERS subprocesses at low
+priority: each reduces its chunks with numpy to bin counts and moments,
+and only those small partials cross to the thread, keeping the Tk thread
+free of the GIL contention a sampling thread would cause.
+"""
+import multiprocessing
+import os
+import queue
+import threading
+import time
+
+import numpy as np
+
+from generators import generate_exercise
+from moments import RunningMoments, expectation, variance
+from support import get_index
+
+MODES   = ("generator", "exact")
+WORKERS = max(1, min(4, (os.cpu_count() or 2) - 1))
+
+
+# ─── HISTOGRAM SPECS ─────────────────────────────────────────────────────────
+def _clipped(lo: int, hi: int):
+    """Integer bins floor(v) clipped to [lo, hi]; edge bins collect overflow."""
+    labels = [str(v) for v in range(lo, hi + 1)]
+    labels[0], labels[-1] = f"≤{lo}", f"≥{hi}"
+    return (lambda v: np.clip(np.floor(v), lo, hi).astype(np.int64) - lo), labels
+
+
+def histogram_specs() -> list:
+    """Return [(title, column, binning function, bin labels), ...]."""
+    specs = [("Type", "typ", lambda v: v.astype(np.int64) - 1, ["1", "2", "3"])]
+    for title, col, lo, hi in [
+        ("Coefficient a", "a",     -9, 9),
+        ("Coefficient b", "b",    -12, 12),
+        ("Coefficient c", "c",    -12, 12),
+        ("Discriminant Δ", "delta", -3, 40),
+    ]:
+        specs.append((title, col, *_clipped(lo, hi)))
+    return specs
+
+
+def _index_columns(index) -> dict:
+    return {"typ": index.typ, "a": index.lead, "b": index.b, "c": index.c,
+            "delta": index.delta}
+
+
+def _reduce(specs, cols: dict) -> tuple:
+    """Return (bin counts per spec, RunningMoments of Δ) of one chunk."""
+    bins = [np.bincount(fn(cols[col]), minlength=len(labels))
+            for _, col, fn, labels in specs]
+    return bins, RunningMoments.from_chunks([cols["delta"]])
+
+
+def _generator_columns(n: int) -> dict:
+    rows = [tuple(generate_exercise()) for _ in range(n)]
+    a, b, c, delta, typ = (np.array(col, dtype=np.float64) for col in zip(*rows))
+    return {"typ": typ, "a": a, "b": b, "c": c, "delta": delta}
+
+
+def _generator_worker(out, stop, chunk: int, seed) -> None:
+    """Subprocess body: reduce chunks of real draws until ``stop`` is set."""
+    if hasattr(os, "nice"):
+        os.nice(10)                         # the UI comes first
+    np.random.seed(seed)                    # generate_exercise draws from np.random
+    specs = histogram_specs()
+    while not stop.is_set():
+        part = _reduce(specs, _generator_columns(chunk))
+        while not stop.is_set():
+            try:
+                out.put(part, timeout=0.1)
+                break
+            except queue.Full:
+                pass
+
+
+# ─── SAMPLER ─────────────────────────────────────────────────────────────────
+class LabSampler:
+    """Background Monte Carlo sampler with online accumulators."""
+
+    def __init__(self, chunk: int = 1 << 16, gen_chunk: int = 1 << 11, seed=None,
+                 mode: str = "generator"):
+        self.index     = get_index()
+        self.chunk     = chunk              # exact mode
+        self.gen_chunk = gen_chunk          # generator mode, per worker
+        self.specs     = histogram_specs()
+        cols           = _index_columns(self.index)
+        self.exact     = [np.bincount(fn(cols[col]), weights=self.index.prob,
+                                      minlength=len(labels))
+                          for _, col, fn, labels in self.specs]
+        self.exact_mean = expectation(self.index.prob, self.index.delta)
+        self.exact_var  = variance(self.index.prob, self.index.delta)
+
+        self.mode    = mode
+        self.counts  = [np.zeros(len(labels), dtype=np.int64) for *_, labels in self.specs]
+        self.moments = RunningMoments()
+        self.elapsed = 0.0
+
+        self._cols   = cols
+        self._cdf    = np.cumsum(self.index.prob) / self.index.prob.sum()
+        self._seeds  = np.random.SeedSequence(seed)
+        self._rng    = np.random.default_rng(self._seeds.spawn(1)[0])
+        self._lock   = threading.Lock()
+        self._stop   = threading.Event()
+        self._thread = None
+        self._procs  = []                   # generator-mode workers, with their queue
+        self._queue  = self._halt = None
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self) -> None:
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="mesim-lab", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def reset(self) -> None:
+        with self._lock:
+            for c in self.counts:
+                c[:] = 0
+            self.moments = RunningMoments()
+            self.elapsed = 0.0
+
+    def set_mode(self, mode: str) -> None:
+        """Switch between MODES; the accumulators restart from zero."""
+        if mode not in MODES:
+            raise ValueError(f"unknown lab mode {mode!r}, expected one of {MODES}")
+        with self._lock:
+            self.mode = mode
+        self.reset()
+
+    # ── Draws ────────────────────────────────────────────────────────────────
+    def _exact_chunk(self) -> dict:
+        ids = np.minimum(np.searchsorted(self._cdf, self._rng.random(self.chunk)),
+                         len(self._cdf) - 1)
+        return {k: v[ids] for k, v in self._cols.items()}
+
+    def _start_workers(self) -> None:
+        if self._procs:
+            return
+        ctx         = multiprocessing.get_context("spawn")    # never fork the Tk process
+        self._queue = ctx.Queue(maxsize=4 * WORKERS)
+        self._halt  = ctx.Event()
+        for ss in self._seeds.spawn(WORKERS):
+            p = ctx.Process(target=_generator_worker, name="mesim-lab-worker", daemon=True,
+                            args=(self._queue, self._halt, self.gen_chunk,
+                                  int(ss.generate_state(1)[0])))
+            p.start()
+            self._procs.append(p)
+
+    def _stop_workers(self) -> None:
+        if not self._procs:
+            return
+        self._halt.set()
+        for p in self._procs:
+            p.join(timeout=1)
+            if p.is_alive():
+                p.terminate()
+        self._queue.cancel_join_thread()
+        self._procs, self._queue, self._halt = [], None, None
+
+    def _next_part(self, mode: str):
+        """Return the next (bins, moments) partial, or None if none is ready yet."""
+        if mode == "exact":
+            self._stop_workers()
+            return _reduce(self.specs, self._exact_chunk())
+        self._start_workers()
+        try:
+            return self._queue.get(timeout=0.1)
+        except queue.Empty:
+            return None
+
+    def _run(self):
+        t_last = time.perf_counter()
+        try:
+            while not self._stop.is_set():
+                mode = self.mode
+                part = self._next_part(mode)
+                now  = time.perf_counter()
+                with self._lock:
+                    # None: workers still starting; mode switched mid-chunk: drop it
+                    if part is not None and mode == self.mode:
+                        bins, moments = part
+                        for acc, b in zip(self.counts, bins):
+                            acc += b
+                        self.moments.merge(moments)
+                        self.elapsed += now - t_last
+                t_last = now
+        finally:
+            self._stop_workers()
+
+    def snapshot(self) -> dict:
+        """Return the current empirical state, safe to read from the UI thread."""
+        with self._lock:
+            counts  = [c.copy() for c in self.counts]
+            n, mean = self.moments.n, self.moments.mean
+            var     = self.moments.variance
+            elapsed = self.elapsed
+        total = max(n, 1)
+        return {
+            "n":        n,
+            "mode":     self.mode,
+            "rate":     n / elapsed if elapsed else 0.0,
+            "mean":     mean,
+            "variance": var,
+            "hists":    [(title, labels, c / total, exact)
+                         for (title, _, _, labels), c, exact
+                         in zip(self.specs, counts, self.exact)],
+        }
@@ -0,0 +1,197 @@
+"""Declarative sampling laws of ``generate_exercise``.
+
+The sets and probabilities the generators draw from are read from a JSON
+spec (``distributions.json`` next to this file, or ``MESIM_DISTRIBUTIONS``),
+validated with exact fractions and compiled once into CDF tables:
+
+    {"sets": {"E": [-9, ..., 9], ...},
+     "laws": {"ELL": {"on": "E_POS", "p": ["1/2", "1/36", ...]},
+              "Z":   {"on": "E",     "p": {"1": "1/2", "*": "1/34"}},
+              "E":   {"on": "E",     "p": "uniform"}, ...}}
+
+Compiled specs are cached by a SHA-256 of the file content, so loading the
+same spec again is a dictionary lookup.  ``Law.draw`` consumes exactly one
+``np.random.rand()`` and returns what ``generate_discrete_sample`` would
+for the same values and probabilities.
+"""
+import hashlib
+import json
+import os
+from bisect import bisect_left
+from fractions import Fraction
+
+import numpy as np
+
+LAWS_PATH = os.environ.get("MESIM_DISTRIBUTIONS") or \
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "distributions.json")
+
+# Laws the generators draw from, with the set each must be on (the support
+# index pairs them that way), and sets whose values the code dispatches on
+REQUIRED   = {"TYPES": "TYPES", "E": "E", "E_TINY": "E_TINY", "ELL": "E_POS",
+              "BRANCH": "BRANCHES", "Z": "E", "E_SMALL": "E_SMALL", "E_POS": "E_POS"}
+FIXED_SETS = {"TYPES": [1, 2, 3], "BRANCHES": [1, 2]}
+INT32_MAX  = 2 ** 31 - 1                # bank / session record fields
+
+# Values the builders can take: no zero divisors, sqrt of positive l, int8 params
+_SET_RULES = {
+    "E":       (lambda v: v != 0, "non-zero"),
+    "E_POS":   (lambda v: v > 0,  "positive"),
+    "E_TINY":  (lambda v: v > 0,  "positive"),
+    "E_SMALL": (lambda v: v != 0, "non-zero"),
+}
+
+_COMPILED = {}
+
+
+class Law:
+    """One compiled discrete law: values, exact and float probabilities, CDF."""
+    __slots__ = ("name", "values", "exact", "probs", "cdf", "_last")
+
+    def __init__(self, name: str, values, exact):
+        self.name   = name
+        self.values = list(values)
+        self.exact  = tuple(exact)
+        self.probs  = [float(p) for p in self.exact]
+        # Accumulated in float exactly like generate_discrete_sample's loop
+        self.cdf, cumul = [], 0.0
+        for p in self.probs:
+            cumul += p
+            self.cdf.append(cumul)
+        self._last  = len(self.values) - 1
+
+    def draw(self):
+        """Draw one value (first k with U <= cdf[k], as the reference loop)."""
+        return self.values[min(bisect_left(self.cdf, np.random.rand()), self._last)]
+
+    def __len__(self):
+        return len(self.values)
+
+    def __repr__(self):
+        return f"Law({self.name!r}, {len(self.values)} values)"
+
+
+class Distributions:
+    """A validated spec: named sets and compiled laws (``dist["E"]``)."""
+    __slots__ = ("sets", "laws", "digest", "path")
+
+    def __init__(self, sets: dict, laws: dict, digest: str, path: str = None):
+        self.sets, self.laws, self.digest, self.path = sets, laws, digest, path
+
+    def __getitem__(self, name: str) -> Law:
+        return self.laws[name]
+
+
+# ─── VALIDATION ──────────────────────────────────────────────────────────────
+def _prob(v, where: str) -> Fraction:
+    try:
+        p = Fraction(str(v))
+    except (ValueError, ZeroDivisionError):
+        raise ValueError(f"{where}: {v!r} is not a probability") from None
+    if p < 0:
+        raise ValueError(f"{where}: negative probability {v!r}")
+    return p
+
+
+def _probs(name: str, values: list, p) -> list:
+    """Turn one law's ``p`` entry into exact probabilities, one per value."""
+    where = f"law {name}"
+    if p == "uniform":
+        return [Fraction(1, len(values))] * len(values)
+    if isinstance(p, list):
+        if len(p) != len(values):
+            raise ValueError(f"{where}: {len(p)} probabilities for {len(values)} values")
+        return [_prob(v, where) for v in p]
+    if isinstance(p, dict):
+        rest  = p.get("*")
+        given = {}
+        for k, v in p.items():
+            if k == "*":
+                continue
+            try:
+                given[int(k)] = _prob(v, where)
+            except ValueError:
+                raise ValueError(f"{where}: bad entry {k!r}: {v!r}") from None
+        stray = set(given) - set(values)
+        if stray:
+            raise ValueError(f"{where}: values {sorted(stray)} are not in its set")
+        if rest is None and len(given) != len(values):
+            raise ValueError(f"{where}: no probability for {sorted(set(values) - set(given))}"
+                             " and no \"*\" entry")
+        rest = _prob(rest, where) if rest is not None else None
+        return [given.get(v, rest) for v in values]
+    raise ValueError(f"{where}: p must be \"uniform\", a list or a mapping")
+
+
+def compile_spec(spec: dict, digest: str = "", path: str = None) -> Distributions:
+    """Validate a parsed spec and compile every law; raise ValueError if invalid."""
+    sets = {}
+    for name, values in dict(spec.get("sets", {})).items():
+        if not isinstance(values, list) or not values or \
+           not all(isinstance(v, int) and not isinstance(v, bool) for v in values):
+            raise ValueError(f"set {name}: expected a non-empty list of integers")
+        if len(set(values)) != len(values):
+            raise ValueError(f"set {name}: repeated values")
+        if any(abs(v) > 127 for v in values):
+            raise ValueError(f"set {name}: values must lie in -127..127")
+        rule = _SET_RULES.get(name)
+        if rule and not all(rule[0](v) for v in values):
+            raise ValueError(f"set {name}: values must be {rule[1]}")
+        sets[name] = values
+    for name, fixed in FIXED_SETS.items():
+        if sets.get(name) != fixed:
+            raise ValueError(f"set {name}: must be {fixed}")
+
+    laws = {}
+    for name, entry in dict(spec.get("laws", {})).items():
+        on = entry.get("on") if isinstance(entry, dict) else None
+        if on not in sets:
+            raise ValueError(f"law {name}: \"on\" must name one of the sets {sorted(sets)}")
+        exact = _probs(name, sets[on], entry.get("p"))
+        total = sum(exact)
+        if total != 1:
+            raise ValueError(f"law {name}: probabilities sum to {total}, not 1")
+        laws[name] = Law(name, sets[on], exact)
+    missing = [n for n in REQUIRED if n not in laws]
+    if missing:
+        raise ValueError(f"missing laws: {', '.join(missing)}")
+    for name, on in REQUIRED.items():
+        if spec["laws"][name]["on"] != on:
+            raise ValueError(f"law {name}: must be on set {on}")
+    _check_range(sets)
+    return Distributions(sets, laws, digest, path)
+
+
+def _check_range(sets: dict) -> None:
+    """Raise ValueError if a numerator of a, b, c or Δ could overflow int32.
+
+    Worst cases per builder, with M = max|E|, T = max E_TINY, S = max|E_SMALL|
+    and P = max E_POS; denominators (≤ 4M, ≤ M²) are far smaller.
+    """
+    M, T, S, P = (max(abs(v) for v in sets[n]) for n in ("E", "E_TINY", "E_SMALL", "E_POS"))
+    worst = [
+        ("type 1 c",       M * M + T),           # (b² + e) / 4|a|
+        ("type 3 Δ",       4 * M * M),           # (h − k)² / l²
+        ("type 3 surd c",  M * M + P ** 3),      # h² − p·e²
+        ("type 3 surd Δ",  4 * S * S * P ** 3),  # 4·l²·p·e²
+    ]
+    for what, bound in worst:
+        if bound > INT32_MAX:
+            raise ValueError(f"sets too wide: {what} can reach {bound}, beyond int32")
+
+
+# ─── LOADING ─────────────────────────────────────────────────────────────────
+def load_laws(path: str = None) -> Distributions:
+    """Load, validate and compile the spec at ``path``, cached by content hash."""
+    path = path or LAWS_PATH
+    with open(path, "rb") as f:
+        data = f.read()
+    digest = hashlib.sha256(data).hexdigest()
+    dist = _COMPILED.get(digest)
+    if dist is None:
+        try:
+            spec = json.loads(data)
+            dist = compile_spec(spec, digest, path)
+        except ValueError as e:
+            raise ValueError(f"{path}: {e}") from None
+        _COMPILED[digest] = dist
+    return dist
@@ -0,0 +1,240 @@
+"""Local load generator for the exercise / grading service.
+
+Closed-loop workers (one thread each) start together behind a barrier, then
+issue a weighted mix of generate / grade / stats requests until the
+duration runs out.  Targets are either the library called in-process, or
+an HTTP service (``service.py``) — optionally spawned locally with
+``--serve`` so load generator and server do not share a GIL.
+
+The report (throughput, p50 / p99 / p99.9 latency, error rate per request
+type) is printed as JSON; ``--out x.jsonl`` appends it as one line for
+trend tracking.
+
+    python loadtest.py --serve -c 2000 -d 30 --mix generate=6,grade=3,stats=1
+"""
+import argparse
+import datetime
+import http.client
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+import time
+from urllib.parse import urlparse
+
+import numpy as np
+
+from generators import generate_exercise, grade_answer, load_stats
+
+OPS = ("generate", "grade", "stats")
+
+
+def parse_mix(text: str) -> dict:
+    """Parse "generate=6,grade=3,stats=1" into {op: weight}."""
+    mix = {}
+    for part in text.split(","):
+        op, _, w = part.partition("=")
+        if op.strip() not in OPS:
+            raise ValueError(f"unknown request type {op!r}, expected one of {OPS}")
+        mix[op.strip()] = float(w or 1)
+    return mix
+
+
+# ─── CLIENTS ─────────────────────────────────────────────────────────────────
+class InProcessClient:
+    """Calls the library directly: measures the work, not the transport."""
+
+    def __init__(self):
+        self.last = None
+
+    def generate(self):
+        self.last = generate_exercise()
+
+    def grade(self):
+        if self.last is None:
+            self.generate()
+        grade_answer(self.last, str(float(self.last.delta_r)), str(self.last.nsol))
+
+    def stats(self):
+        load_stats()
+
+    def close(self):
+        pass
+
+
+class HttpClient:
+    """One keep-alive connection per worker to a service.py-style endpoint."""
+
+    def __init__(self, url: str, timeout: float = 10.0):
+        u = urlparse(url)
+        self.host, self.port, self.timeout = u.hostname, u.port or 80, timeout
+        self.conn    = None
+        self.last_id = None
+
+    def _request(self, method: str, path: str, payload: dict = None) -> dict:
+        if self.conn is None:
+            self.conn = http.client.HTTPConnection(self.host, self.port, timeout=self.timeout)
+        body    = json.dumps(payload).encode() if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body else {}
+        try:
+            self.conn.request(method, path, body=body, headers=headers)
+            r    = self.conn.getresponse()
+            data = r.read()
+        except Exception:
+            self.close()                # reconnect on the next request
+            raise
+        if r.status >= 400:
+            raise RuntimeError(f"HTTP {r.status}")
+        return json.loads(data)
+
+    def generate(self):
+        self.last_id = self._request("GET", "/generate?n=1")["exercises"][0]["id"]
+
+    def grade(self):
+        if self.last_id is None:
+            self.generate()
+        self._request("POST", "/grade", {"id": self.last_id, "delta": "0", "nsol": "1"})
+
+    def stats(self):
+        self._request("GET", "/stats")
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+
+# ─── DRIVER ──────────────────────────────────────────────────────────────────
+def run(make_client, concurrency: int, duration: float, mix: dict, seed: int = 0) -> dict:
+    """Drive ``concurrency`` workers for ``duration`` seconds; return the report."""
+    ops, weights = zip(*mix.items())
+    barrier = threading.Barrier(concurrency + 1)
+    results = [None] * concurrency
+    state   = {"deadline": 0.0}
+
+    def worker(k):
+        client = make_client()
+        rng    = random.Random(seed + k)
+        lat    = {op: [] for op in ops}
+        errors = dict.fromkeys(ops, 0)
+        barrier.wait()
+        deadline = state["deadline"]
+        while time.perf_counter() < deadline:
+            op = rng.choices(ops, weights)[0]
+            t0 = time.perf_counter_ns()
+            try:
+                getattr(client, op)()
+                lat[op].append(time.perf_counter_ns() - t0)
+            except Exception:
+                errors[op] += 1
+        client.close()
+        results[k] = (lat, errors)
+
+    threads = [threading.Thread(target=worker, args=(k,), daemon=True)
+               for k in range(concurrency)]
+    for t in threads:
+        t.start()
+    state["deadline"] = time.perf_counter() + duration
+    started = time.perf_counter()
+    barrier.wait()
+    for t in threads:
+        t.join()
+    elapsed = time.perf_counter() - started
+
+    report = {}
+    total_ok = total_err = 0
+    for op in ops:
+        lat = np.concatenate([np.asarray(r[0][op], dtype=np.int64) for r in results])
+        err = sum(r[1][op] for r in results)
+        n   = len(lat) + err
+        total_ok, total_err = total_ok + len(lat), total_err + err
+        pct = np.percentile(lat, [50, 99, 99.9]) / 1e6 if len(lat) else [None] * 3
+        report[op] = {
+            "requests":       n,
+            "errors":         err,
+            "error_rate":     err / n if n else 0.0,
+            "throughput_rps": len(lat) / elapsed,
+            "p50_ms":         _num(pct[0]),
+            "p99_ms":         _num(pct[1]),
+            "p999_ms":        _num(pct[2]),
+            "max_ms":         _num(lat.max() / 1e6) if len(lat) else None,
+        }
+    n = total_ok + total_err
+    return {
+        "elapsed_s": elapsed,
+        "total": {"requests": n, "errors": total_err,
+                  "error_rate": total_err / n if n else 0.0,
+                  "throughput_rps": total_ok / elapsed},
+        "ops": report,
+    }
+
+
+def _num(v):
+    return None if v is None else round(float(v), 3)
+
+
+def _spawn_service() -> tuple:
+    """Start service.py on a free local port; return (process, url)."""
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    here = os.path.dirname(os.path.abspath(__file__))
+    proc = subprocess.Popen([sys.executable, os.path.join(here, "service.py"),
+                             "--port", str(port)], stdout=subprocess.DEVNULL)
+    for _ in range(100):
+        try:
+            socket.create_connection(("127.0.0.1", port), timeout=0.1).close()
+            return proc, f"http://127.0.0.1:{port}"
+        except OSError:
+            time.sleep(0.05)
+    proc.kill()
+    raise RuntimeError("service.py did not start")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the exercise / grading service.")
+    target = parser.add_mutually_exclusive_group()
+    target.add_argument("--url", help="HTTP service to drive, e.g. http://127.0.0.1:8000")
+    target.add_argument("--serve", action="store_true",
+                        help="spawn service.py locally and drive it over HTTP")
+    parser.add_argument("-c", "--concurrency", type=int, default=50)
+    parser.add_argument("-d", "--duration", type=float, default=10.0, help="seconds")
+    parser.add_argument("--mix", default="generate=6,grade=3,stats=1")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="write the JSON report here (.jsonl: append)")
+    args = parser.parse_args()
+
+    proc, url = (_spawn_service() if args.serve else (None, args.url))
+    make_client = (lambda: HttpClient(url)) if url else InProcessClient
+    try:
+        report = run(make_client, args.concurrency, args.duration,
+                     parse_mix(args.mix), args.seed)
+    finally:
+        if proc is not None:
+            proc.terminate()
+            proc.wait()
+
+    report = {
+        "timestamp":   datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "target":      url or "in-process",
+        "concurrency": args.concurrency,
+        "duration_s":  args.duration,
+        "mix":         parse_mix(args.mix),
+        **report,
+    }
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.out:
+        if args.out.endswith(".jsonl"):
+            with open(args.out, "a") as f:
+                f.write(json.dumps(report) + "\n")
+        else:
+            with open(args.out, "w") as f:
+                f.write(text + "\n")
+
+
+if __name__ == "__main__":
+    main()
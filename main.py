@@ -1,7 +1,34 @@
-from gui import ProjectMESIMApp
+import argparse
+import os
 
 
 def main():
+    parser = argparse.ArgumentParser(description="MESIM · Quadratic Equation Trainer")
+    parser.add_argument("--profile", action="store_true",
+                        help="record call counts and timings, report on exit")
+    parser.add_argument("--profile-out", metavar="PATH",
+                        help="also write the profile report as JSON to PATH")
+    parser.add_argument("--watchdog", action="store_true",
+                        help="log event-loop stalls with main-thread stacks")
+    parser.add_argument("--bank", metavar="PATH",
+                        help="draw quizzes from a binary exercise bank (see bank.py)")
+    parser.add_argument("--distributions", metavar="PATH",
+                        help="sampling laws spec (default: distributions.json)")
+    args = parser.parse_args()
+
+    # These switches are read at import time, so set them before loading the app.
+    if args.profile or args.profile_out:
+        os.environ["MESIM_PROFILE"] = "1"
+    if args.profile_out:
+        os.environ["MESIM_PROFILE_OUT"] = args.profile_out
+    if args.watchdog:
+        os.environ["MESIM_WATCHDOG"] = "1"
+    if args.bank:
+        os.environ["MESIM_BANK"] = args.bank
+    if args.distributions:
+        os.environ["MESIM_DISTRIBUTIONS"] = args.distributions
+
+    from gui import ProjectMESIMApp
     app = ProjectMESIMApp()
     app.mainloop()
 
@@ -0,0 +1,177 @@
+"""Moments of discrete laws and of sample streams.
+
+A law is a pair of sequences (weights, values), as in the sets and
+probabilities of ``generators`` or the columns of the support index:
+
+    >>> expectation([1/4, 1/6, 1/3, 1/4], [-2, -1, 0, 1])
+    -0.41666666666666663
+    >>> variance(["1/4", "1/6", "1/3", "1/4"], [-2, -1, 0, 1], exact=True)
+    Fraction(179, 144)
+
+Float mode is vectorised with numpy.  ``exact=True`` works in Fractions;
+weights and values may then be Fractions, ints or strings such as "1/36"
+(floats are taken at their exact binary value, so pass ``Law.exact`` for
+the spec's probabilities).  ``RunningMoments`` estimates the same
+quantities from samples fed chunk by chunk, for streams too large to keep.
+"""
+from fractions import Fraction
+
+import numpy as np
+
+
+def _law(weights, values, exact: bool):
+    if len(weights) != len(values):
+        raise ValueError(f"{len(weights)} weights for {len(values)} values")
+    if exact:
+        return ([w if isinstance(w, Fraction) else Fraction(w) for w in weights],
+                [v if isinstance(v, Fraction) else Fraction(v) for v in values])
+    return np.asarray(weights, dtype=np.float64), np.asarray(values, dtype=np.float64)
+
+
+# ─── MOMENTS OF A LAW ────────────────────────────────────────────────────────
+def expectation(weights, values, exact: bool = False):
+    """E[X] = Σ wᵢ·xᵢ."""
+    w, x = _law(weights, values, exact)
+    if exact:
+        return sum((wi * xi for wi, xi in zip(w, x)), Fraction(0))
+    return float(w @ x)
+
+
+def moment(weights, values, k: int, central: bool = False, exact: bool = False):
+    """E[X^k], or E[(X − E[X])^k] when ``central``."""
+    w, x = _law(weights, values, exact)
+    if exact:
+        mu = expectation(w, x, exact=True) if central else 0
+        return sum((wi * (xi - mu) ** k for wi, xi in zip(w, x)), Fraction(0))
+    if central:
+        x = x - w @ x
+    return float(w @ x ** k)
+
+
+def variance(weights, values, exact: bool = False):
+    """Var[X] = E[(X − E[X])²]."""
+    return moment(weights, values, 2, central=True, exact=exact)
+
+
+def skewness(weights, values) -> float:
+    """E[(X − μ)³] / σ³."""
+    return moment(weights, values, 3, central=True) / variance(weights, values) ** 1.5
+
+
+def kurtosis(weights, values) -> float:
+    """E[(X − μ)⁴] / σ⁴ (3 for a normal law)."""
+    return moment(weights, values, 4, central=True) / variance(weights, values) ** 2
+
+
+# ─── COMBINING LAWS ──────────────────────────────────────────────────────────
+def mixture(laws, weights, exact: bool = False) -> tuple:
+    """Return the law (weights, values) of Σ wⱼ·lawⱼ over the union of values.
+
+    ``laws`` are (weights, values) pairs, e.g. the law of Δ within each
+    exercise type mixed by the type probabilities.
+    """
+    if len(laws) != len(weights):
+        raise ValueError(f"{len(weights)} weights for {len(laws)} laws")
+    if exact:
+        acc = {}
+        for wj, (pw, pv) in zip(weights, laws):
+            wj = Fraction(wj)
+            for p, v in zip(*_law(pw, pv, exact=True)):
+                acc[v] = acc.get(v, 0) + wj * p
+        values = sorted(acc)
+        return [acc[v] for v in values], values
+    pw = np.concatenate([wj * _law(p, v, False)[0] for wj, (p, v) in zip(weights, laws)])
+    pv = np.concatenate([_law(p, v, False)[1] for p, v in laws])
+    values, inv = np.unique(pv, return_inverse=True)
+    return np.bincount(inv, weights=pw, minlength=len(values)), values
+
+
+def case_laws(index, values, by=None) -> dict:
+    """Split a law over the support index into conditional laws.
+
+    Returns {key: (P[outcome | key], values, P[key])} for each key of ``by``
+    (default: exercise type), so that ``mixture`` of the conditional laws
+    weighted by P[key] gives back the law of ``values``.
+    """
+    by     = index.typ if by is None else np.asarray(by)
+    values = np.asarray(values)
+    out    = {}
+    for key in np.unique(by):
+        m  = by == key
+        pk = float(index.prob[m].sum())
+        out[key.item()] = (index.prob[m] / pk, values[m], pk)
+    return out
+
+
+def empirical_law(samples) -> tuple:
+    """Return (frequencies, distinct values) of a sample array."""
+    values, counts = np.unique(np.asarray(samples), return_counts=True)
+    return counts / counts.sum(), values
+
+
+# ─── STREAMING ESTIMATES ─────────────────────────────────────────────────────
+class RunningMoments:
+    """Online mean and central moments up to 4, updated a chunk at a time.
+
+    Each chunk is reduced with numpy, then merged into the running sums
+    with the pairwise formulas of Chan et al. / Pébay, so memory stays
+    constant however long the stream.
+    """
+    __slots__ = ("n", "mean", "m2", "m3", "m4")
+
+    def __init__(self):
+        self.n, self.mean, self.m2, self.m3, self.m4 = 0, 0.0, 0.0, 0.0, 0.0
+
+    @classmethod
+    def from_chunks(cls, chunks) -> "RunningMoments":
+        """Consume an iterable of sample arrays."""
+        r = cls()
+        for x in chunks:
+            r.update(x)
+        return r
+
+    def update(self, x: np.ndarray) -> None:
+        x = np.asarray(x, dtype=np.float64)
+        if not len(x):
+            return
+        other = RunningMoments()
+        other.n    = len(x)
+        other.mean = float(x.mean())
+        d          = x - other.mean
+        d2         = d * d
+        other.m2   = float(d2.sum())
+        other.m3   = float((d2 * d).sum())
+        other.m4   = float((d2 * d2).sum())
+        self.merge(other)
+
+    def merge(self, other: "RunningMoments") -> None:
+        """Fold in the moments of another, disjoint stream."""
+        na, nb = self.n, other.n
+        if not nb:
+            return
+        if not na:
+            self.n, self.mean = other.n, other.mean
+            self.m2, self.m3, self.m4 = other.m2, other.m3, other.m4
+            return
+        n  = na + nb
+        d  = other.mean - self.mean
+        dn = d / n
+        m2 = self.m2 + other.m2 + d * dn * na * nb
+        m3 = (self.m3 + other.m3 + d * dn * dn * na * nb * (na - nb)
+              + 3 * dn * (na * other.m2 - nb * self.m2))
+        m4 = (self.m4 + other.m4 + d * dn ** 3 * na * nb * (na * na - na * nb + nb * nb)
+              + 6 * dn * dn * (na * na * other.m2 + nb * nb * self.m2)
+              + 4 * dn * (na * other.m3 - nb * self.m3))
+        self.n, self.mean, self.m2, self.m3, self.m4 = n, self.mean + dn * nb, m2, m3, m4
+
+    @property
+    def variance(self) -> float:
+        return self.m2 / self.n if self.n else 0.0
+
+    @property
+    def skewness(self) -> float:
+        return self.m3 / self.n / self.variance ** 1.5 if self.m2 else 0.0
+
+    @property
+    def kurtosis(self) -> float:
+        return self.m4 / self.n / self.variance ** 2 if self.m2 else 0.0
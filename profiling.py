@@ -0,0 +1,147 @@
+"""Opt-in instrumentation: call counts, latency histograms and counters.
+
+Enabled with ``MESIM_PROFILE=1`` (or ``python main.py --profile``).  When it
+is off, ``profiled`` hands the function back untouched and ``count`` is a
+single flag test, so the hot paths pay (almost) nothing.
+
+The report is printed to stderr on exit; set ``MESIM_PROFILE_OUT`` (or pass
+``--profile-out``) to also write it as JSON.
+"""
+import atexit
+import functools
+import json
+import os
+import sys
+import time
+
+ENABLED  = os.environ.get("MESIM_PROFILE", "") not in ("", "0")
+OUT_PATH = os.environ.get("MESIM_PROFILE_OUT") or None
+
+# Latency histogram buckets are powers of two in microseconds:
+# bucket 0 is < 1 µs, bucket k is [2^(k-1), 2^k) µs.
+N_BUCKETS = 24
+
+
+class _Timer:
+    """Running count / total / min / max plus a log2 latency histogram."""
+    __slots__ = ("count", "total_ns", "min_ns", "max_ns", "buckets")
+
+    def __init__(self):
+        self.count    = 0
+        self.total_ns = 0
+        self.min_ns   = None
+        self.max_ns   = 0
+        self.buckets  = [0] * N_BUCKETS
+
+    def add(self, dt_ns: int) -> None:
+        self.count    += 1
+        self.total_ns += dt_ns
+        if self.min_ns is None or dt_ns < self.min_ns:
+            self.min_ns = dt_ns
+        if dt_ns > self.max_ns:
+            self.max_ns = dt_ns
+        k = (dt_ns // 1000).bit_length()
+        self.buckets[min(k, N_BUCKETS - 1)] += 1
+
+    def as_dict(self) -> dict:
+        mean = self.total_ns / self.count if self.count else 0
+        return {
+            "count":    self.count,
+            "total_ms": self.total_ns / 1e6,
+            "mean_us":  mean / 1e3,
+            "min_us":   (self.min_ns or 0) / 1e3,
+            "max_us":   self.max_ns / 1e3,
+            "hist_us":  {_bucket_label(k): n
+                         for k, n in enumerate(self.buckets) if n},
+        }
+
+
+_timers   = {}
+_counters = {}
+
+
+def _bucket_label(k: int) -> str:
+    return "<1" if k == 0 else f"<{1 << k}"
+
+
+def _timer(name: str) -> _Timer:
+    t = _timers.get(name)
+    if t is None:
+        t = _timers[name] = _Timer()
+    return t
+
+
+# ─── PUBLIC API ──────────────────────────────────────────────────────────────
+def profiled(name: str = None):
+    """Decorator recording call count and latency of ``fn`` under ``name``.
+
+    Returns ``fn`` itself when profiling is disabled.
+    """
+    def deco(fn):
+        if not ENABLED:
+            return fn
+        t = _timer(name or fn.__qualname__)
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kw):
+            t0 = time.perf_counter_ns()
+            try:
+                return fn(*args, **kw)
+            finally:
+                t.add(time.perf_counter_ns() - t0)
+        return wrapper
+    return deco
+
+
+def record(name: str, dt_ns: int) -> None:
+    """Add one externally measured duration (nanoseconds) to timer ``name``."""
+    if ENABLED:
+        _timer(name).add(dt_ns)
+
+
+def count(name: str, n: int = 1) -> None:
+    """Bump the plain counter ``name`` by ``n``."""
+    if ENABLED:
+        _counters[name] = _counters.get(name, 0) + n
+
+
+def report() -> dict:
+    """Return every timer and counter as a JSON-serialisable dict."""
+    return {
+        "timers":   {k: t.as_dict() for k, t in sorted(_timers.items())},
+        "counters": dict(sorted(_counters.items())),
+    }
+
+
+def format_report() -> str:
+    """Return the report as a fixed-width text table."""
+    lines = [f"{'name':<28}{'calls':>9}{'total ms':>11}"
+             f"{'mean µs':>10}{'min µs':>10}{'max µs':>11}"]
+    for name, t in sorted(_timers.items()):
+        d = t.as_dict()
+        lines.append(f"{name:<28}{d['count']:>9}{d['total_ms']:>11.2f}"
+                     f"{d['mean_us']:>10.1f}{d['min_us']:>10.1f}{d['max_us']:>11.1f}")
+    for name, n in sorted(_counters.items()):
+        lines.append(f"{name:<28}{n:>9}")
+    return "\n".join(lines)
+
+
+def dump(path: str = None) -> None:
+    """Print the report to stderr and write it as JSON to ``path`` if given."""
+    print("── MESIM profile ──", file=sys.stderr)
+    print(format_report(), file=sys.stderr)
+    path = path or OUT_PATH
+    if path:
+        with open(path, "w") as f:
+            json.dump(report(), f, indent=2)
+
+
+def reset() -> None:
+    """Zero every timer and counter (decorated functions keep their timer)."""
+    for t in _timers.values():
+        t.__init__()
+    _counters.clear()
+
+
+if ENABLED:
+    atexit.register(dump)
@@ -0,0 +1,174 @@
+"""Sampling without replacement, with a persisted seen-set across sessions.
+
+The seen-set is a bitset over the distinct equations of the support index
+(about 6 000 bits, under 1 KB on disk), so membership tests and updates are
+a single byte operation.  ``draw_fresh`` never repeats an equation within a
+quiz and skips every equation already seen in earlier sessions; once all
+equations matching a request have been seen, those bits are cleared and a
+new cycle starts (the current quiz's equations stay excluded, so a reset
+never repeats one within a quiz that fits in the pool).
+"""
+import os
+import struct
+
+import numpy as np
+
+from support import get_index
+
+SEEN_PATH = os.path.expanduser("~/.mesim_seen.bin")
+
+_MAGIC  = b"MSEEN1\0\0"
+_HEADER = struct.Struct("<8sII")    # magic, support fingerprint, number of bits
+
+
+class SeenSet:
+    """Fixed-size bitset of equation ids."""
+    __slots__ = ("size", "fingerprint", "bits")
+
+    def __init__(self, size: int, fingerprint: int = 0, bits: bytes = None):
+        self.size        = size
+        self.fingerprint = fingerprint
+        self.bits        = np.zeros((size + 7) // 8, dtype=np.uint8)
+        if bits is not None:
+            self.bits[:] = np.frombuffer(bits, dtype=np.uint8)
+
+    # ── Single ids, O(1) ─────────────────────────────────────────────────────
+    def __contains__(self, i: int) -> bool:
+        return bool(self.bits[i >> 3] >> (i & 7) & 1)
+
+    def add(self, i: int) -> None:
+        self.bits[i >> 3] |= np.uint8(1 << (i & 7))
+
+    def __len__(self):
+        return int(np.unpackbits(self.bits).sum())
+
+    # ── Vectorised ───────────────────────────────────────────────────────────
+    def contains_many(self, ids: np.ndarray) -> np.ndarray:
+        return (self.bits[ids >> 3] >> (ids & 7) & 1).astype(bool)
+
+    def discard_many(self, ids: np.ndarray) -> None:
+        np.bitwise_and.at(self.bits, ids >> 3, ~(1 << (ids & 7)).astype(np.uint8))
+
+    def clear(self) -> None:
+        self.bits[:] = 0
+
+    # ── Persistence ──────────────────────────────────────────────────────────
+    @classmethod
+    def for_index(cls, index=None) -> "SeenSet":
+        index = index or get_index()
+        return cls(index.n_equations, index.fingerprint)
+
+    @classmethod
+    def load(cls, path: str = SEEN_PATH, index=None) -> "SeenSet":
+        """Return the persisted set, or an empty one if missing or stale."""
+        index = index or get_index()
+        try:
+            with open(path, "rb") as f:
+                magic, fp, size = _HEADER.unpack(f.read(_HEADER.size))
+                bits = f.read()
+            if (magic == _MAGIC and fp == index.fingerprint
+                    and size == index.n_equations and len(bits) == (size + 7) // 8):
+                return cls(size, fp, bits)
+        except (OSError, struct.error):
+            pass
+        return cls.for_index(index)
+
+    def save(self, path: str = SEEN_PATH) -> None:
+        """Write the set atomically (temp file + rename)."""
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, self.fingerprint, self.size))
+            f.write(self.bits.tobytes())
+        os.replace(tmp, path)
+
+
+class _Fenwick:
+    """Prefix sums of non-negative weights with O(log n) update and search."""
+    __slots__ = ("n", "tree", "top")
+
+    def __init__(self, weights: np.ndarray):
+        self.n = n = len(weights)
+        # tree[i] = sum of weights (i - lowbit(i), i], built from one cumsum
+        i   = np.arange(1, n + 1)
+        cs  = np.concatenate(([0.0], np.cumsum(weights)))
+        self.tree = [0.0] + (cs[i] - cs[i - (i & -i)]).tolist()
+        self.top  = 1 << (n.bit_length() - 1) if n else 0
+
+    def add(self, i: int, dw: float) -> None:
+        i += 1
+        while i <= self.n:
+            self.tree[i] += dw
+            i += i & -i
+
+    def total(self) -> float:
+        s, i = 0.0, self.n
+        while i:
+            s += self.tree[i]
+            i -= i & -i
+        return s
+
+    def search(self, u: float) -> int:
+        """Return the first position whose prefix sum exceeds ``u``."""
+        pos, step, tree = 0, self.top, self.tree
+        while step:
+            if pos + step <= self.n and tree[pos + step] <= u:
+                pos += step
+                u   -= tree[pos]
+            step >>= 1
+        return pos
+
+
+def draw_fresh(n: int, seen: SeenSet, index=None, rng=None, **constraints) -> list:
+    """Draw ``n`` exercises whose equations are not in ``seen``, and mark them.
+
+    Accepts the same constraints as ``SupportIndex.mask``.  Probabilities are
+    those of ``generate_exercise`` renormalised over the unseen outcomes.
+    The fresh weights live in a Fenwick tree built once, so each draw costs
+    O(log |pool|) plus zeroing the outcomes of the drawn equation.
+    """
+    index = index or get_index()
+    rng   = rng or np.random
+    pool  = np.flatnonzero(index.mask(**constraints))
+    if not len(pool):
+        raise ValueError(f"no exercise satisfies {constraints}")
+    eq   = index.eq_id[pool]
+    prob = index.prob[pool]
+
+    # eq_id -> positions in the pool holding that equation
+    order      = np.argsort(eq, kind="stable")
+    eqs, first = np.unique(eq[order], return_index=True)
+    positions  = dict(zip(eqs.tolist(), np.split(order, first[1:])))
+
+    def build():
+        fresh  = ~seen.contains_many(eq)
+        weight = np.where(fresh, prob, 0.0)
+        return weight, _Fenwick(weight), len(np.unique(eq[fresh]))
+
+    weight, tree, remaining = build()
+    out, drawn = [], []
+    for _ in range(n):
+        if not remaining:
+            # Pool exhausted: start a new cycle, still excluding this quiz's draws
+            seen.discard_many(eq)
+            for e in drawn:
+                seen.add(e)
+            weight, tree, remaining = build()
+            if not remaining:              # the quiz alone covers the pool
+                seen.discard_many(eq)
+                drawn = []
+                weight, tree, remaining = build()
+        k = tree.search(rng.random() * tree.total())
+        if k >= len(pool) or weight[k] == 0:
+            # Rounding drift in the running sums: rebuild them exactly
+            weight, tree, remaining = build()
+            k = min(tree.search(rng.random() * tree.total()), len(pool) - 1)
+        e = int(eq[k])
+        seen.add(e)
+        drawn.append(e)
+        for j in positions[e].tolist():
+            if weight[j]:
+                tree.add(j, -weight[j])
+                weight[j] = 0.0
+        remaining -= 1
+        out.append(index.exercise(pool[k]))
+    return out
@@ -0,0 +1,124 @@
+"""Minimal headless exercise / grading service (stdlib HTTP, JSON).
+
+    GET  /generate?n=5     -> {"exercises": [{"id", "equation", "type"}, ...]}
+    POST /grade            <- {"id", "delta", "nsol"}  -> {"score", "delta", "nsol"}
+    GET  /stats            -> persisted session stats
+
+Issued exercises are kept in a bounded ring so /grade can look them up.
+
+    python service.py --port 8000
+"""
+import argparse
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+import numpy as np
+
+from bank import BANK_DTYPE, from_record, to_record
+from generators import generate_exercise, grade_answer, load_stats
+
+MAX_ISSUED   = 100_000
+MAX_PER_CALL = 1000
+
+
+class ExerciseStore:
+    """Thread-safe ring of the last ``capacity`` issued exercises, keyed by id.
+
+    Exercises are kept as packed bank records (36 bytes each) and rebuilt
+    when graded; id ``i`` lives in slot ``(i - 1) % capacity`` until it is
+    overwritten.
+    """
+
+    def __init__(self, capacity: int = MAX_ISSUED):
+        self.capacity = capacity
+        self._records = np.zeros(capacity, dtype=BANK_DTYPE)
+        self._next    = 1
+        self._lock    = threading.Lock()
+
+    def add(self, ex) -> int:
+        rec = to_record(ex)
+        with self._lock:
+            i = self._next
+            self._next += 1
+            self._records[(i - 1) % self.capacity] = rec
+            return i
+
+    def get(self, i: int):
+        with self._lock:
+            if not max(1, self._next - self.capacity) <= i < self._next:
+                return None
+            rec = self._records[(i - 1) % self.capacity].copy()
+        return from_record(rec)
+
+
+class Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"       # keep-alive for load tests
+    disable_nagle_algorithm = True      # headers and body go out as two writes
+    store = ExerciseStore()
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, code: int, payload: dict) -> None:
+        body = json.dumps(payload).encode()
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        if url.path == "/generate":
+            try:
+                n = int(parse_qs(url.query).get("n", ["1"])[0])
+                assert 0 < n <= MAX_PER_CALL
+            except Exception:
+                return self._send(400, {"error": f"n must be in 1..{MAX_PER_CALL}"})
+            out = []
+            for _ in range(n):
+                ex = generate_exercise()
+                out.append({"id": self.store.add(ex), "equation": ex.equation,
+                            "type": ex.typ})
+            return self._send(200, {"exercises": out})
+        if url.path == "/stats":
+            return self._send(200, load_stats())
+        self._send(404, {"error": "not found"})
+
+    def do_POST(self):
+        if urlparse(self.path).path != "/grade":
+            return self._send(404, {"error": "not found"})
+        try:
+            req = json.loads(self.rfile.read(int(self.headers.get("Content-Length", 0))))
+            ex  = self.store.get(int(req["id"]))
+        except Exception:
+            return self._send(400, {"error": "expected JSON {id, delta, nsol}"})
+        if ex is None:
+            return self._send(404, {"error": "unknown or expired exercise id"})
+        self._send(200, {"score": grade_answer(ex, req.get("delta", ""), req.get("nsol", "")),
+                         "delta": ex.solution.delta, "nsol": ex.nsol})
+
+
+class Server(ThreadingHTTPServer):
+    daemon_threads     = True
+    request_queue_size = 1024           # a whole class connects at once
+
+
+def make_server(host: str = "127.0.0.1", port: int = 8000) -> Server:
+    return Server((host, port), Handler)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless exercise / grading service.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    server = make_server(args.host, args.port)
+    print(f"Serving on http://{args.host}:{server.server_port}")
+    server.serve_forever()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""Quiz session state with incremental checkpoints.
+
+The checkpoint file is written once when a quiz starts and then only grows
+by fixed 7-byte records, so checkpointing costs the same for the first and
+the thousandth exercise:
+
+    header     magic "MESIMSES", format version, generator version, number
+               of exercises, SHA-256 of the sampling laws spec
+    exercises  one bank record (bank.BANK_DTYPE) per exercise
+    records    appended (index u32, score in half points u8, time left u16);
+               score PROGRESS marks a timer checkpoint of an exercise that
+               is not answered yet
+
+A torn final record (crash mid-write) is ignored on restore.
+"""
+import os
+import struct
+
+import numpy as np
+
+from bank import BANK_DTYPE, ExercisePool
+from generators import GENERATOR_VERSION, LAWS
+
+SESSION_PATH = os.path.expanduser("~/.mesim_session.bin")
+
+_MAGIC  = b"MESIMSES"
+_HEADER = struct.Struct("<8sHHI32s")    # magic, version, generator, count, laws
+_ANSWER = struct.Struct("<IBH")         # exercise index, score × 2, time left
+PROGRESS = 0xFF                         # score byte of a timer checkpoint
+VERSION = 2
+
+
+class QuizSession:
+    """Everything needed to continue a quiz: exercises, progress and score."""
+    __slots__ = ("exercises", "current_ex", "score", "results", "time_left",
+                 "finished", "path", "_fd")
+
+    def __init__(self, exercises=(), path: str = None):
+        # Packed records: a long quiz costs 36 bytes per exercise, plus one
+        # reference to its worked solution, prepared here rather than on screen
+        self.exercises  = (exercises if isinstance(exercises, ExercisePool)
+                           else ExercisePool(exercises)).prepare()
+        self.current_ex = 0
+        self.score      = 0.0
+        self.results    = [None] * len(self.exercises)
+        self.time_left  = None          # current exercise's timer; None: not started
+        self.finished   = False         # results saved and checkpoint deleted
+        self.path       = path          # None: not checkpointed
+        self._fd        = None
+
+    # ── Checkpointing ────────────────────────────────────────────────────────
+    @classmethod
+    def start(cls, exercises, path: str = SESSION_PATH) -> "QuizSession":
+        """Create a session and write its initial checkpoint atomically."""
+        s = cls(exercises, path)
+        records = s.exercises.records
+        tmp = path + ".tmp"
+        with open(tmp, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, VERSION, GENERATOR_VERSION, len(records),
+                                 bytes.fromhex(LAWS.digest)))
+            f.write(records.tobytes())
+        os.replace(tmp, path)
+        s._open()
+        return s
+
+    def _open(self):
+        self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND)
+
+    def _append(self, score_byte: int) -> None:
+        if self._fd is not None:
+            os.write(self._fd, _ANSWER.pack(self.current_ex, score_byte,
+                                             max(0, min(self.time_left or 0, 0xFFFF))))
+
+    def record(self, ex_score: float) -> None:
+        """Store the score of the current exercise and append it to the checkpoint."""
+        self.results[self.current_ex] = ex_score
+        self.score += ex_score
+        self._append(int(ex_score * 2))
+        self.time_left = None           # the next exercise starts a fresh timer
+
+    def save_time(self) -> None:
+        """Checkpoint the remaining time of the current, unanswered exercise."""
+        if self.time_left is not None and self.current_ex < len(self.exercises):
+            self._append(PROGRESS)
+
+    @property
+    def complete(self) -> bool:
+        return self.current_ex >= len(self.exercises)
+
+    def finish(self) -> None:
+        """Close and delete the checkpoint: the quiz is over."""
+        self.finished = True
+        self.close()
+        if self.path:
+            try:
+                os.remove(self.path)
+            except OSError:
+                pass
+
+    def close(self) -> None:
+        if self._fd is not None:
+            os.close(self._fd)
+            self._fd = None
+
+    # ── Restoring ────────────────────────────────────────────────────────────
+    @staticmethod
+    def peek(path: str = SESSION_PATH):
+        """Return (answered, total) of a checkpoint still on disk, or None.
+
+        answered == total means the quiz was answered through but its
+        results were never saved.  Skips over the exercise records.
+        """
+        try:
+            with open(path, "rb") as f:
+                magic, version, _, n, _ = _HEADER.unpack(f.read(_HEADER.size))
+                body = _HEADER.size + n * BANK_DTYPE.itemsize
+                f.seek(body)
+                tail = f.read()
+        except (OSError, struct.error):
+            return None
+        if magic != _MAGIC or version != VERSION or os.path.getsize(path) < body:
+            return None
+        tail     = tail[:len(tail) - len(tail) % _ANSWER.size]
+        answered = {i for i, score, _ in _ANSWER.iter_unpack(tail)
+                    if score != PROGRESS and i < n}
+        return len(answered), n
+
+    @classmethod
+    def load(cls, path: str = SESSION_PATH) -> "QuizSession":
+        """Rebuild an unfinished session from its checkpoint and reopen it."""
+        with open(path, "rb") as f:
+            data = f.read()
+        # Exercises are stored verbatim, so a session resumes under any laws
+        magic, version, _, n, _ = _HEADER.unpack_from(data)
+        if magic != _MAGIC or version != VERSION:
+            raise ValueError(f"{path}: not a quiz checkpoint")
+        body    = _HEADER.size + n * BANK_DTYPE.itemsize
+        records = np.frombuffer(data, dtype=BANK_DTYPE, count=n, offset=_HEADER.size)
+
+        s = cls(ExercisePool(records=records.copy()), path)
+        tail  = data[body:]
+        timer = {}                      # last timer checkpoint per exercise
+        for off in range(0, len(tail) - _ANSWER.size + 1, _ANSWER.size):
+            i, half_points, time_left = _ANSWER.unpack_from(tail, off)
+            if i >= n:
+                continue
+            if half_points == PROGRESS:
+                timer[i] = time_left
+            elif s.results[i] is None:
+                s.results[i] = half_points / 2
+                s.score     += half_points / 2
+                s.current_ex = max(s.current_ex, i + 1)
+        s.time_left = timer.get(s.current_ex)
+        if len(tail) % _ANSWER.size:
+            # Drop a torn record so the next append starts on a boundary
+            with open(path, "r+b") as f:
+                f.truncate(len(data) - len(tail) % _ANSWER.size)
+        s._open()
+        return s
@@ -0,0 +1,145 @@
+"""Exact step-by-step corrections for quadratic exercises.
+
+Every coefficient the generators produce is rational, or (type 2) a signed
+square root of a rational.  Numbers are therefore handled as surds
+``q·√r`` with q a Fraction and r a square-free integer, which keeps Δ, the
+root formula and the roots exact: ``x = (3 - 2√5)/4`` instead of
+``x = -0.368034``.
+"""
+import math
+from fractions import Fraction
+
+
+class Solution:
+    """Prepared correction.
+
+    delta  exact Δ as text
+    nsol   number of real solutions
+    roots  exact roots as text, in the order x₁, x₂
+    steps  list of (label, text, is_result) rows for the correction screen
+    """
+    __slots__ = ("delta", "nsol", "roots", "steps")
+
+    def __init__(self, delta: str, nsol: int, roots: list, steps: list):
+        self.delta = delta
+        self.nsol  = nsol
+        self.roots = roots
+        self.steps = steps
+
+
+# ─── SURDS ───────────────────────────────────────────────────────────────────
+def _square_free(n: int):
+    """Return (k, r) with n = k²·r and r square-free."""
+    k, r, f = 1, n, 2
+    while f * f <= r:
+        while r % (f * f) == 0:
+            r //= f * f
+            k *= f
+        f += 1
+    return k, r
+
+
+def _sqrt(q: Fraction):
+    """Return √q (q ≥ 0) as a surd (coef, rad)."""
+    # √(n/d) = √(n·d) / d
+    k, r = _square_free(q.numerator * q.denominator)
+    return Fraction(k, q.denominator), r
+
+
+def _as_surd(v):
+    """Return v as a surd (coef, rad), recovering exact values from floats."""
+    if not isinstance(v, float):
+        return Fraction(v), 1
+    # Tolerances are tight on purpose: a loose match would happily
+    # approximate a surd by a large-denominator fraction.
+    f = Fraction(v).limit_denominator(1000)
+    if math.isclose(f, v, rel_tol=1e-12, abs_tol=1e-12):
+        return f, 1
+    sq = Fraction(v * v).limit_denominator(1000)
+    if not math.isclose(sq, v * v, rel_tol=1e-12, abs_tol=1e-12):
+        raise ValueError(f"{v!r} is not a rational or a square root of one")
+    coef, rad = _sqrt(sq)
+    return (coef if v > 0 else -coef), rad
+
+
+def _fmt_q(q: Fraction) -> str:
+    return str(q).replace("-", "−")
+
+
+def _fmt_surd(coef: Fraction, rad: int) -> str:
+    """Format coef·√rad as e.g. 3/2, −√5, 2√3/3."""
+    if rad == 1 or coef == 0:
+        return _fmt_q(coef)
+    sign = "−" if coef < 0 else ""
+    num, den = abs(coef.numerator), coef.denominator
+    s = f"{'' if num == 1 else num}√{rad}"
+    return f"{sign}{s}" if den == 1 else f"{sign}{s}/{den}"
+
+
+def _paren(s: str) -> str:
+    return f"({s})" if s.startswith("−") or "/" in s or "√" in s else s
+
+
+def _fmt_sum(p: Fraction, t: Fraction, rad: int) -> str:
+    """Format p + t·√rad over a single denominator, e.g. (3 − 2√5)/4."""
+    if rad == 1:
+        return _fmt_q(p + t)
+    den = math.lcm(p.denominator, t.denominator)
+    pn, tn = int(p * den), int(t * den)
+    surd = f"{'' if abs(tn) == 1 else abs(tn)}√{rad}"
+    if pn == 0:
+        body = ("−" if tn < 0 else "") + surd
+    else:
+        body = f"{_fmt_q(Fraction(pn))} {'−' if tn < 0 else '+'} {surd}"
+    if den == 1:
+        return body
+    return f"({body})/{den}" if pn else f"{body}/{den}"
+
+
+# ─── BUILDER ─────────────────────────────────────────────────────────────────
+def build_solution(a, b, c) -> Solution:
+    """Return the exact correction of ax² + bx + c = 0 (a ≠ 0)."""
+    qa, ra = _as_surd(a)
+    qb, rb = _as_surd(b)
+    qc, rc = _as_surd(c)
+    if ra != 1 or rc != 1:
+        raise ValueError("only b may be irrational")
+
+    sa, sb, sc = _fmt_surd(qa, 1), _fmt_surd(qb, rb), _fmt_surd(qc, 1)
+    b2    = qb * qb * rb
+    delta = b2 - 4 * qa * qc
+    steps = [
+        ("Discriminant  Δ =", "b² − 4ac", False),
+        ("",                  f"= {_paren(sb)}² − 4·{_paren(sa)}·{_paren(sc)}", False),
+        ("",                  f"= {_fmt_q(b2)} − {_paren(_fmt_q(4 * qa * qc))}", False),
+        ("",                  f"= {_fmt_q(delta)}", False),
+    ]
+
+    if delta < 0:
+        nsol, roots = 0, []
+        steps.append(("Number of solutions:", "0   (Δ < 0)", False))
+    elif delta == 0:
+        nsol  = 1
+        roots = [_fmt_surd(-qb / (2 * qa), rb)]
+        steps += [
+            ("Number of solutions:", "1   (Δ = 0)", False),
+            ("Root formula:",        "x₀ = −b / (2a)", False),
+            ("Solution:",            f"x₀ = {roots[0]}", True),
+        ]
+    else:
+        if rb != 1:
+            raise ValueError("irrational b with Δ > 0 is not supported")
+        nsol = 2
+        s, rad = _sqrt(delta)
+        # x₁ = (−b − √Δ)/(2a), x₂ = (−b + √Δ)/(2a)
+        p, t  = -qb / (2 * qa), s / (2 * qa)
+        roots = [_fmt_sum(p, -t, rad), _fmt_sum(p, t, rad)]
+        sqrt_d = _fmt_surd(s, rad)
+        steps += [
+            ("Number of solutions:", "2   (Δ > 0)", False),
+            ("Root formula:",        "x = (−b ± √Δ) / (2a)", False),
+            ("",                     f"√Δ = √{_paren(_fmt_q(delta))} = {sqrt_d}", False),
+            ("Solutions:",           f"x₁ = {roots[0]}", True),
+            ("",                     f"x₂ = {roots[1]}", True),
+        ]
+    return Solution(_fmt_q(delta), nsol, roots, steps)
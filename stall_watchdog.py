@@ -0,0 +1,135 @@
+"""Tk event-loop stall detector.
+
+A periodic ``after`` probe measures how late the mainloop runs it.  A helper
+thread watches the same deadline and, as soon as the probe is overdue by
+more than the threshold, grabs the main thread's stack *while it is still
+stuck* — by the time the probe itself fires the culprit is long gone.
+
+Stalls land in a bounded ring buffer that is written to JSON on exit.
+Enabled with ``MESIM_WATCHDOG=1`` (or ``python main.py --watchdog``).
+"""
+import atexit
+import collections
+import json
+import os
+import sys
+import threading
+import time
+import traceback
+
+import profiling
+
+ENABLED   = os.environ.get("MESIM_WATCHDOG", "") not in ("", "0")
+DUMP_PATH = os.environ.get("MESIM_WATCHDOG_OUT") or os.path.expanduser("~/.mesim_stalls.json")
+
+
+class StallWatchdog:
+    """Detect mainloop stalls of ``root`` and keep the last ``capacity`` of them."""
+
+    def __init__(self, root, interval_ms: int = 100, threshold_ms: int = 250,
+                 capacity: int = 64):
+        self.root         = root
+        self.interval_ms  = interval_ms
+        self.threshold_ms = threshold_ms
+        self.events       = collections.deque(maxlen=capacity)
+
+        self._main_id  = threading.get_ident()   # must be built on the Tk thread
+        self._due      = 0.0
+        self._beat     = 0                       # bumped first thing by every probe
+        self._stack    = None                    # (due, stack) from the helper thread
+        self._lock     = threading.Lock()
+        self._stop     = threading.Event()
+        self._after_id = None
+        self._thread   = None
+
+    # ── Lifecycle ────────────────────────────────────────────────────────────
+    def start(self) -> None:
+        self._stop.clear()
+        self._schedule()
+        self._thread = threading.Thread(target=self._monitor, name="mesim-watchdog",
+                                        daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._after_id is not None:
+            try:
+                self.root.after_cancel(self._after_id)
+            except Exception:
+                pass
+            self._after_id = None
+
+    # ── Main-thread probe ────────────────────────────────────────────────────
+    def _schedule(self):
+        self._due      = time.monotonic() + self.interval_ms / 1000
+        self._after_id = self.root.after(self.interval_ms, self._probe)
+
+    def _probe(self):
+        self._beat += 1
+        due    = self._due
+        lag_ms = (time.monotonic() - due) * 1000
+        # Move the deadline first so the helper cannot capture this probe itself
+        if not self._stop.is_set():
+            self._schedule()
+        with self._lock:
+            capture, self._stack = self._stack, None
+        if lag_ms >= self.threshold_ms:
+            self.events.append({
+                "time":   time.time(),
+                "lag_ms": round(lag_ms, 1),
+                "stack":  capture[1] if capture and capture[0] == due else [],
+            })
+            profiling.count("watchdog.stalls")
+
+    # ── Helper thread ────────────────────────────────────────────────────────
+    def _monitor(self):
+        poll = self.threshold_ms / 2000
+        while not self._stop.wait(poll):
+            with self._lock:
+                due = self._due
+                if (time.monotonic() - due) * 1000 < self.threshold_ms:
+                    continue
+                if self._stack is not None and self._stack[0] == due:
+                    continue          # already captured this stall
+                beat  = self._beat
+                frame = sys._current_frames().get(self._main_id)
+                stack = traceback.format_stack(frame) if frame else []
+                ticked = _in_probe(frame)
+                del frame
+                # The loop ticked meanwhile: the stall is over, the stack is not its culprit
+                if ticked or self._beat != beat or self._due != due:
+                    continue
+                # Tagged with its deadline: a capture for another probe is dropped
+                self._stack = (due, stack)
+
+    # ── Reporting ────────────────────────────────────────────────────────────
+    def snapshot(self) -> list:
+        """Return the buffered stall events, oldest first."""
+        return list(self.events)
+
+    def dump(self, path: str = None) -> None:
+        """Write the buffered stall events to ``path`` as JSON."""
+        events = self.snapshot()
+        if not events:
+            return
+        with open(path or DUMP_PATH, "w") as f:
+            json.dump({"interval_ms": self.interval_ms,
+                       "threshold_ms": self.threshold_ms,
+                       "stalls": events}, f, indent=2)
+
+
+def _in_probe(frame) -> bool:
+    """Whether ``frame`` is running this module's own probe."""
+    while frame is not None:
+        if frame.f_code is StallWatchdog._probe.__code__:
+            return True
+        frame = frame.f_back
+    return False
+
+
+def install(root) -> StallWatchdog:
+    """Start a watchdog on ``root`` and dump its buffer on exit."""
+    wd = StallWatchdog(root)
+    wd.start()
+    atexit.register(wd.dump)
+    return wd
@@ -0,0 +1,206 @@
+"""Attribute index over the finite support of ``generate_exercise``.
+
+Every exercise the generators can produce comes from a finite set of sampled
+values (a, b, e for type 1, e, l for type 2, ...).  The index enumerates all
+of them once, with their exact probability under ``generate_exercise``, and
+tabulates the attributes teachers filter on.  A constrained draw then samples
+directly from the matching outcomes with renormalised probabilities instead
+of rejecting most of the generator's output.
+
+    >>> idx = get_index()
+    >>> idx.sample(10, typ=3, integer_roots=True, abs_delta_below=50)
+"""
+import functools
+import math
+import zlib
+from fractions import Fraction
+from itertools import product
+
+import numpy as np
+
+from generators import (
+    Exercise,
+    E, E_POS, E_TINY, E_SMALL,
+    P_E, P_POS, P_TINY, P_SMALL, P_ELL, P_Z, P_BRANCH, P_TYPES,
+    build_case1, build_case2, build_case3_rational, build_case3_surd,
+)
+
+# Builder codes stored in ``SupportIndex.case``
+CASE1, CASE2, CASE3_RATIONAL, CASE3_SURD = 0, 1, 2, 3
+
+_BUILDERS = {
+    CASE1:          build_case1,
+    CASE2:          build_case2,
+    CASE3_RATIONAL: build_case3_rational,
+    CASE3_SURD:     build_case3_surd,
+}
+_TYPE_OF = {CASE1: 1, CASE2: 2, CASE3_RATIONAL: 3, CASE3_SURD: 3}
+_ARITY   = {CASE1: 3, CASE2: 2, CASE3_RATIONAL: 3, CASE3_SURD: 4}
+
+
+def _exact_outcome(case, params):
+    """Return exact (a, b, c, delta, roots) for one outcome.
+
+    Coefficients are Fractions, or None where irrational (type 2 with a
+    non-square l); roots are Fractions, or None where irrational.
+    """
+    if case == CASE1:
+        a, b, c, delta = build_case1(*params)
+        return a, b, c, delta, []
+    if case == CASE2:
+        e, ell = params
+        r = math.isqrt(ell)
+        if r * r != ell:
+            return 1, None, Fraction(e * e, ell), Fraction(0), [None]
+        x0 = Fraction(e, r)
+        return 1, -2 * x0, x0 * x0, Fraction(0), [x0]
+    if case == CASE3_RATIONAL:
+        h, k, ll = params
+        a, b, c, delta = build_case3_rational(h, k, ll)
+        return a, b, c, delta, [Fraction(h, ll), Fraction(k, ll)]
+    h, l, e, p = params
+    a, b, c, delta = build_case3_surd(h, l, e, p)
+    r = math.isqrt(p)
+    if r * r != p:
+        return a, b, c, Fraction(delta), [None, None]
+    return a, b, c, Fraction(delta), [Fraction(-h - e * r, l), Fraction(-h + e * r, l)]
+
+
+def _enumerate():
+    """Yield (case, params, probability) for every outcome of the generators."""
+    p1, p2, p3 = P_TYPES
+    for (a, pa), (b, pb), (e, pe) in product(zip(E, P_E), zip(E, P_E),
+                                             zip(E_TINY, P_TINY)):
+        yield CASE1, (a, b, e), p1 * pa * pb * pe
+    for (e, pe), (ell, pl) in product(zip(E, P_E), zip(E_POS, P_ELL)):
+        yield CASE2, (e, ell), p2 * pe * pl
+    q1, q2 = P_BRANCH
+    for (h, ph), (k, pk), (ll, pz) in product(zip(E, P_E), zip(E, P_E), zip(E, P_Z)):
+        yield CASE3_RATIONAL, (h, k, ll), p3 * q1 * ph * pk * pz
+    for (h, ph), (l, pl), (e, pe), (p, pp) in product(zip(E, P_E), zip(E_SMALL, P_SMALL),
+                                                      zip(E_POS, P_POS), zip(E_POS, P_POS)):
+        yield CASE3_SURD, (h, l, e, p), p3 * q2 * ph * pl * pe * pp
+
+
+class SupportIndex:
+    """Column arrays over every outcome of ``generate_exercise``.
+
+    Columns (one entry per outcome):
+        case       builder code (CASE1 ... CASE3_SURD)
+        params     sampled values, padded with 0 to width 4
+        prob       probability of the outcome under generate_exercise
+        typ        exercise type 1, 2 or 3
+        lead       leading coefficient a
+        b, c       other coefficients, as floats
+        delta      Δ (exact, as float)
+        abs_delta  |Δ|
+        int_roots  True when there are real roots and all are integers
+        max_den    largest denominator of a, b, c (0 if b is irrational)
+        eq_id      id of the equation; outcomes giving the same a, b, c share it
+    """
+
+    def __init__(self):
+        case, params, prob = [], [], []
+        lead, coefs, deltas, int_roots, max_den = [], [], [], [], []
+        eq_ids, keys = [], {}
+        for c, ps, p in _enumerate():
+            if not p:
+                continue                # zero-probability law entry in the spec
+            a, b, cc, delta, roots = _exact_outcome(c, ps)
+            # Irrational b only occurs in type 2, where the built float is exact enough
+            built = _BUILDERS[c](*ps)
+            key = (a, b if b is not None else round(built[1], 9), cc)
+            eq_ids.append(keys.setdefault(key, len(keys)))
+            case.append(c)
+            params.append(ps + (0,) * (4 - len(ps)))
+            prob.append(p)
+            lead.append(a)
+            coefs.append((float(built[1]), float(built[2])))
+            deltas.append(float(delta))
+            int_roots.append(bool(roots) and all(
+                r is not None and r.denominator == 1 for r in roots))
+            max_den.append(0 if b is None else max(
+                Fraction(v).denominator for v in (a, b, cc)))
+
+        self.case      = np.array(case, dtype=np.int8)
+        self.params    = np.array(params, dtype=np.int8)
+        self.prob      = np.array(prob, dtype=np.float64)
+        self.typ       = np.array([_TYPE_OF[c] for c in case], dtype=np.int8)
+        self.lead      = np.array(lead, dtype=np.int16)
+        self.b, self.c = np.array(coefs, dtype=np.float64).T
+        self.delta     = np.array(deltas, dtype=np.float64)
+        self.abs_delta = np.abs(self.delta)
+        self.int_roots = np.array(int_roots, dtype=bool)
+        self.max_den   = np.array(max_den, dtype=np.int32)
+        self.eq_id     = np.array(eq_ids, dtype=np.int32)
+        self.n_equations = len(keys)
+        self.fingerprint = zlib.crc32(self.params.tobytes() + self.eq_id.tobytes())
+        self._cdfs     = {}
+
+    def __len__(self):
+        return len(self.case)
+
+    # ── Queries ──────────────────────────────────────────────────────────────
+    def mask(self, typ=None, integer_roots=None, abs_delta_below=None,
+             unit_leading=None, max_denominator=None) -> np.ndarray:
+        """Return a boolean mask of the outcomes matching every given constraint.
+
+        typ               exercise type (int) or collection of types
+        integer_roots     require (True) or exclude (False) all-integer roots
+        abs_delta_below   keep |Δ| < this bound
+        unit_leading      require (True) or exclude (False) |a| = 1
+        max_denominator   keep rational coefficients with denominators ≤ this
+        """
+        m = np.ones(len(self), dtype=bool)
+        if typ is not None:
+            m &= np.isin(self.typ, np.atleast_1d(typ))
+        if integer_roots is not None:
+            m &= self.int_roots == bool(integer_roots)
+        if abs_delta_below is not None:
+            m &= self.abs_delta < abs_delta_below
+        if unit_leading is not None:
+            m &= (np.abs(self.lead) == 1) == bool(unit_leading)
+        if max_denominator is not None:
+            m &= (self.max_den > 0) & (self.max_den <= max_denominator)
+        return m
+
+    def probability(self, **constraints) -> float:
+        """Return the probability that ``generate_exercise`` meets the constraints."""
+        return float(self.prob[self.mask(**constraints)].sum())
+
+    def _subset(self, constraints: dict):
+        """Return (outcome ids, normalised CDF) for a constraint set, cached."""
+        key = tuple(sorted((k, v if np.isscalar(v) or v is None else tuple(v))
+                           for k, v in constraints.items()))
+        hit = self._cdfs.get(key)
+        if hit is None:
+            ids = np.flatnonzero(self.mask(**constraints))
+            if not len(ids):
+                raise ValueError(f"no exercise satisfies {constraints}")
+            cdf = np.cumsum(self.prob[ids])
+            hit = self._cdfs[key] = (ids, cdf / cdf[-1])
+        return hit
+
+    # ── Sampling ─────────────────────────────────────────────────────────────
+    def sample_ids(self, n: int = 1, rng=None, **constraints) -> np.ndarray:
+        """Draw ``n`` outcome ids from the constrained, renormalised law."""
+        ids, cdf = self._subset(constraints)
+        U = (rng or np.random).random(n)
+        k = np.minimum(np.searchsorted(cdf, U), len(ids) - 1)
+        return ids[k]
+
+    def exercise(self, i: int) -> Exercise:
+        """Build outcome ``i`` as an Exercise, exactly like generate_exercise."""
+        case   = int(self.case[i])
+        params = [int(v) for v in self.params[i, :_ARITY[case]]]
+        return Exercise(*_BUILDERS[case](*params), int(self.typ[i]))
+
+    def sample(self, n: int = 1, rng=None, **constraints) -> list:
+        """Draw ``n`` exercises satisfying ``constraints`` (see ``mask``)."""
+        return [self.exercise(i) for i in self.sample_ids(n, rng, **constraints)]
+
+
+@functools.lru_cache(maxsize=None)
+def get_index() -> SupportIndex:
+    """Return the process-wide index, built on first use."""
+    return SupportIndex()
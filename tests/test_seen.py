@@ -0,0 +1,44 @@
+import numpy as np
+
+from bank import ExerciseBank, _eq_key, _eq_lookup, write_bank
+from seen import SeenSet, draw_fresh
+from support import get_index
+
+
+def _equations(exercises) -> list:
+    return [(ex.a, ex.b, ex.c) for ex in exercises]
+
+
+def test_draw_fresh_no_repeat_across_cycle_reset():
+    index = get_index()
+    eqs   = np.unique(index.eq_id[index.mask(typ=2)])
+    rng   = np.random.default_rng(0)
+    for _ in range(50):
+        seen = SeenSet.for_index(index)
+        for e in eqs[rng.permutation(len(eqs))[5:]]:   # only 5 left this cycle
+            seen.add(int(e))
+        drawn = _equations(draw_fresh(20, seen, index, rng, typ=2))
+        assert len(set(drawn)) == 20
+
+
+def test_draw_fresh_longer_than_pool():
+    index = get_index()
+    seen  = SeenSet.for_index(index)
+    n     = len(np.unique(index.eq_id[index.mask(typ=2)]))
+    drawn = draw_fresh(n + 10, seen, index, np.random.default_rng(1), typ=2)
+    assert len(set(_equations(drawn[:n]))) == n
+
+
+def test_bank_draw_fresh_no_repeat_across_cycle_reset(tmp_path):
+    path = str(tmp_path / "bank.bin")
+    write_bank(path, 3000, seed=3, typ=2)
+    bank   = ExerciseBank(path)
+    lookup = _eq_lookup()
+    eqs    = sorted({lookup[_eq_key(r)] for r in bank.records})
+    rng    = np.random.default_rng(2)
+    for _ in range(10):
+        seen = SeenSet.for_index()
+        for e in rng.permutation(eqs)[5:]:
+            seen.add(int(e))
+        drawn = [lookup[_eq_key(r)] for r in bank.draw_fresh(20, seen, rng).records]
+        assert len(set(drawn)) == 20
@@ -0,0 +1,30 @@
+import numpy as np
+
+import generators
+from session import QuizSession
+from support import get_index
+
+
+def test_session_renders_without_building_solutions(monkeypatch):
+    session = QuizSession(get_index().sample(200, np.random.default_rng(0)))
+
+    def fail(*args):
+        raise AssertionError("build_solution called while rendering")
+
+    monkeypatch.setattr(generators, "build_solution", fail)
+    # show_exercise / show_correction / _review_row read these, twice over
+    # a pool larger than its decoded-exercise cache
+    for _ in range(2):
+        for i in range(len(session.exercises)):
+            ex = session.exercises[i]
+            assert ex.equation
+            assert ex.solution.delta
+            for label, value, is_result in ex.solution.steps:
+                assert label is not None
+
+
+def test_prepared_solutions_match_built_ones():
+    exercises = get_index().sample(50, np.random.default_rng(1))
+    session   = QuizSession(exercises)
+    for ex, stored in zip(exercises, session.exercises):
+        assert stored.solution.steps == ex.solution.steps
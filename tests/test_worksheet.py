@@ -0,0 +1,34 @@
+import os
+
+import pytest
+from PIL import Image
+from pypdf import PdfReader
+
+from worksheet import _merge_pdf, build_worksheets
+
+
+def _pages(path) -> int:
+    return len(PdfReader(path).pages)
+
+
+def test_merge_pdf_page_count(tmp_path):
+    paths = []
+    for i in range(7):
+        path = str(tmp_path / f"sheet-{i + 1:04d}.pdf")
+        Image.new("RGB", (60, 80), "white").save(path)
+        paths.append(path)
+    out = str(tmp_path / "worksheets.pdf")
+    _merge_pdf(paths, out)
+    assert _pages(out) == 7
+
+
+def test_default_pdf_is_one_document_per_set(tmp_path):
+    try:
+        import cairosvg  # noqa: F401
+    except (ImportError, OSError):
+        pytest.skip("cairosvg / libcairo not available")
+    written = build_worksheets(25, str(tmp_path), per_page=10, key=True, seed=0, workers=1)
+    assert sorted(map(os.path.basename, written)) == ["answer-key.pdf", "worksheets.pdf"]
+    assert sorted(os.listdir(tmp_path)) == ["answer-key.pdf", "worksheets.pdf"]
+    for path in written:
+        assert _pages(path) == 3
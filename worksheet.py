@@ -0,0 +1,186 @@
+"""Printable worksheets rendered with the cairosvg / Pillow stack.
+
+Each page is laid out as an A4 SVG holding ``per_page`` exercises from
+``format_equation``, with optional answer-key pages built from the grading
+rules (Δ to 4 decimals, number of solutions) and the exact roots.  SVG
+layout is cheap string formatting done up front; rasterising to PDF / PNG
+is the slow part and is spread over a process pool.
+
+PDF pages are then concatenated into one vector document per set.
+
+    python worksheet.py -n 5000 --per-page 10 --key -o class-set
+"""
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from html import escape
+
+import numpy as np
+
+from bank import ExercisePool
+from generators import generate_exercise
+
+PAGE_W, PAGE_H = 595, 842          # A4 in points
+MARGIN         = 56
+FONT           = "DejaVu Sans, Helvetica, Arial, sans-serif"
+MONO           = "DejaVu Sans Mono, Courier New, monospace"
+ACCENT         = "#e11d48"
+MUTED          = "#71717a"
+MERGE_BATCH    = 16                # PNG pages decoded at once when merging
+SETS           = (("sheet", "worksheets.pdf"), ("key", "answer-key.pdf"))
+
+
+# ─── LAYOUT ──────────────────────────────────────────────────────────────────
+def _text(x, y, s, size=12, fill="#18181b", family=FONT, weight="normal", anchor="start"):
+    return (f'<text x="{x}" y="{y}" font-family="{family}" font-size="{size}" '
+            f'font-weight="{weight}" fill="{fill}" text-anchor="{anchor}">{escape(s)}</text>')
+
+
+def page_svg(exercises, first_no: int, page_no: int, n_pages: int,
+             title: str = "Quadratic equations", key: bool = False) -> str:
+    """Return one A4 page as SVG: a worksheet page, or its answer key."""
+    parts = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{PAGE_W}" '
+             f'height="{PAGE_H}" viewBox="0 0 {PAGE_W} {PAGE_H}">',
+             f'<rect width="{PAGE_W}" height="{PAGE_H}" fill="#ffffff"/>',
+             _text(MARGIN, MARGIN, title + ("  —  Answer key" if key else ""),
+                   size=18, weight="bold"),
+             _text(PAGE_W - MARGIN, MARGIN, f"Page {page_no} / {n_pages}",
+                   size=10, fill=MUTED, anchor="end")]
+    if not key:
+        parts.append(_text(MARGIN, MARGIN + 24,
+                           "Name: ______________________     Date: ____________",
+                           size=11, fill=MUTED))
+    parts.append(f'<line x1="{MARGIN}" y1="{MARGIN + 36}" x2="{PAGE_W - MARGIN}" '
+                 f'y2="{MARGIN + 36}" stroke="#e4e4e7"/>')
+
+    top  = MARGIN + 64
+    step = (PAGE_H - top - MARGIN) / max(len(exercises), 1)
+    for k, ex in enumerate(exercises):
+        y = top + k * step
+        parts.append(_text(MARGIN, y, f"{first_no + k}.", size=12, fill=MUTED))
+        parts.append(_text(MARGIN + 30, y, ex.equation, size=14, family=MONO,
+                           weight="bold", fill=ACCENT))
+        if key:
+            roots = ",  ".join(ex.solution.roots) or "no real root"
+            line  = f"Δ = {ex.solution.delta}  (≈ {float(ex.delta_r):g})" \
+                    f"     solutions: {ex.nsol}     {roots}"
+        else:
+            line  = "Δ = ____________     Number of real solutions: ____"
+        parts.append(_text(MARGIN + 30, y + 20, line, size=11, fill="#52525b"))
+    parts.append("</svg>")
+    return "".join(parts)
+
+
+# ─── RENDERING ───────────────────────────────────────────────────────────────
+def _render(job) -> str:
+    """Process-pool worker: rasterise one SVG page to ``path``."""
+    svg, path, fmt, scale = job
+    if fmt == "svg":
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(svg)
+        return path
+    import cairosvg
+    if fmt == "pdf":
+        cairosvg.svg2pdf(bytestring=svg.encode(), write_to=path)
+    else:
+        cairosvg.svg2png(bytestring=svg.encode(), write_to=path, scale=scale)
+    return path
+
+
+def _merge_png(paths, out_path, batch: int = MERGE_BATCH) -> None:
+    """Bundle rendered PNG pages into one (raster) PDF with Pillow.
+
+    Pages are decoded ``batch`` at a time and appended to the PDF, so memory
+    stays at a few pages (~6 MB each at scale 2) however long the set.
+    """
+    from PIL import Image
+    for start in range(0, len(paths), batch):
+        pages = [Image.open(p).convert("RGB") for p in paths[start:start + batch]]
+        pages[0].save(out_path, save_all=True, append=start > 0, append_images=pages[1:])
+        for page in pages:
+            page.close()
+
+
+def _merge_pdf(paths, out_path) -> None:
+    """Concatenate rendered PDF pages into one (vector) PDF with pypdf."""
+    from pypdf import PdfWriter
+    writer = PdfWriter()
+    for p in paths:
+        writer.append(p)
+    with open(out_path, "wb") as f:
+        writer.write(f)
+
+
+def build_worksheets(n: int, out_dir: str, per_page: int = 10, key: bool = False,
+                     fmt: str = "pdf", workers: int = None, seed: int = None,
+                     scale: float = 2.0, merge: bool = False, exercises=None,
+                     split: bool = False) -> list:
+    """Write ``n`` exercises as worksheet pages (plus key pages) to ``out_dir``.
+
+    Returns the list of written files.  PDF pages are merged into
+    ``worksheets.pdf`` / ``answer-key.pdf`` and removed, unless ``split``;
+    ``merge`` bundles PNG pages into the same two PDFs, next to the PNGs.
+    """
+    if exercises is None:
+        if seed is not None:
+            np.random.seed(seed)
+        exercises = (generate_exercise() for _ in range(n))
+    # Packed records: a class set stays at 36 bytes per exercise until laid out
+    exercises = exercises if isinstance(exercises, ExercisePool) else ExercisePool(exercises)
+    os.makedirs(out_dir, exist_ok=True)
+
+    pages   = [exercises[i:i + per_page] for i in range(0, len(exercises), per_page)]
+    n_pages = len(pages)
+    jobs    = []
+    for kind in ("sheet", "key") if key else ("sheet",):
+        for p, page in enumerate(pages):
+            svg  = page_svg(page, p * per_page + 1, p + 1, n_pages, key=kind == "key")
+            path = os.path.join(out_dir, f"{kind}-{p + 1:04d}.{fmt}")
+            jobs.append((svg, path, fmt, scale))
+
+    if fmt == "svg" or len(jobs) == 1:
+        written = [_render(j) for j in jobs]
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            written = list(pool.map(_render, jobs, chunksize=max(1, len(jobs) // 64)))
+
+    if fmt == "pdf" and not split:
+        merged = []
+        for kind, name in SETS:
+            paths = [w for w in written if os.path.basename(w).startswith(kind)]
+            if paths:
+                _merge_pdf(paths, os.path.join(out_dir, name))
+                merged.append(os.path.join(out_dir, name))
+                for p in paths:
+                    os.remove(p)
+        written = merged
+    elif merge and fmt == "png":
+        for kind, name in SETS:
+            paths = [w for w in written if os.path.basename(w).startswith(kind)]
+            if paths:
+                _merge_png(paths, os.path.join(out_dir, name))
+                written.append(os.path.join(out_dir, name))
+    return written
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Render printable worksheets.")
+    parser.add_argument("-n", type=int, default=50, help="number of exercises")
+    parser.add_argument("-o", "--out", default="worksheets", help="output directory")
+    parser.add_argument("--per-page", type=int, default=10)
+    parser.add_argument("--key", action="store_true", help="also render answer keys")
+    parser.add_argument("--format", choices=("pdf", "png", "svg"), default="pdf")
+    parser.add_argument("--merge", action="store_true",
+                        help="bundle PNG pages into one PDF per set")
+    parser.add_argument("--split", action="store_true",
+                        help="keep one PDF per page instead of one per set")
+    parser.add_argument("--workers", type=int, help="render processes (default: all cores)")
+    parser.add_argument("--seed", type=int)
+    args = parser.parse_args()
+    written = build_worksheets(args.n, args.out, args.per_page, args.key, args.format,
+                               args.workers, args.seed, merge=args.merge, split=args.split)
+    print(f"{len(written)} files written to {args.out}")
+
+
+if __name__ == "__main__":
+    main()